@@ -1,6 +1,7 @@
 import os
 import uuid
 import pymediainfo
+from functools import cached_property
 
 from typing import Optional, Literal
 from typing import Dict, Any
@@ -177,6 +178,11 @@ class AudioMaterial:
             raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
         self.duration = int(info.audio_tracks[0].duration * 1e3)  # type: ignore
 
+    @cached_property
+    def duration_seconds(self) -> float:
+        """素材时长, 单位为秒, 首次访问时计算并缓存"""
+        return self.duration / 1000000
+
     def export_json(self) -> Dict[str, Any]:
         return {
             "app_id": 0,
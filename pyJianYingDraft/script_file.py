@@ -4,7 +4,7 @@ import math
 from copy import deepcopy
 
 from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import Type, Dict, List, Any, Iterable
 
 from . import util
 from . import assets
@@ -167,6 +167,8 @@ class ScriptFile:
     """草稿文件中的素材信息部分"""
     tracks: Dict[str, Track]
     """轨道信息"""
+    _tracks_by_type: Dict[TrackType, List[Track]]
+    """按类型索引的轨道, 与`tracks`同步维护"""
 
     imported_materials: Dict[str, List[Dict[str, Any]]]
     """导入的素材信息"""
@@ -190,6 +192,7 @@ class ScriptFile:
 
         self.materials = ScriptMaterial()
         self.tracks = {}
+        self._tracks_by_type = {}
 
         self.imported_materials = {}
         self.imported_tracks = []
@@ -256,19 +259,25 @@ class ScriptFile:
         """
 
         if track_name is None:
-            if track_type in [track.track_type for track in self.tracks.values()]:
+            if self._tracks_by_type.get(track_type):
                 raise NameError("'%s' 类型的轨道已存在, 请为新轨道指定名称以避免混淆" % track_type)
             track_name = track_type.name
-        if track_name in [track.name for track in self.tracks.values()]:
+        if track_name in self.tracks:
             raise NameError("名为 '%s' 的轨道已存在" % track_name)
 
         render_index = track_type.value.render_index + relative_index
         if absolute_index is not None:
             render_index = absolute_index
 
-        self.tracks[track_name] = Track(track_type, track_name, render_index, mute)
+        track = Track(track_type, track_name, render_index, mute)
+        self.tracks[track_name] = track
+        self._tracks_by_type.setdefault(track_type, []).append(track)
         return self
 
+    def get_tracks_by_type(self, track_type: TrackType) -> List[Track]:
+        """获取指定类型的所有轨道, 按创建顺序排列, 返回的列表不应被修改"""
+        return self._tracks_by_type.get(track_type, [])
+
     def _get_track(self, segment_type: Type[BaseSegment], track_name: Optional[str]) -> Track:
         # 指定轨道名称
         if track_name is not None:
@@ -276,11 +285,11 @@ class ScriptFile:
                 raise NameError("不存在名为 '%s' 的轨道" % track_name)
             return self.tracks[track_name]
         # 寻找唯一的同类型的轨道
-        count = sum([1 for track in self.tracks.values() if track.accept_segment_type == segment_type])
-        if count == 0: raise NameError("不存在接受 '%s' 的轨道" % segment_type)
-        if count > 1: raise NameError("存在多个接受 '%s' 的轨道, 请指定轨道名称" % segment_type)
+        candidates = [track for track in self.tracks.values() if track.accept_segment_type == segment_type]
+        if len(candidates) == 0: raise NameError("不存在接受 '%s' 的轨道" % segment_type)
+        if len(candidates) > 1: raise NameError("存在多个接受 '%s' 的轨道, 请指定轨道名称" % segment_type)
 
-        return next(track for track in self.tracks.values() if track.accept_segment_type == segment_type)
+        return candidates[0]
 
     def add_segment(self, segment: Union[VideoSegment, StickerSegment, AudioSegment, TextSegment],
                     track_name: Optional[str] = None) -> "ScriptFile":
@@ -301,7 +310,37 @@ class ScriptFile:
         target.add_segment(segment)
         self.duration = max(self.duration, segment.end)
 
-        # 自动添加相关素材
+        self._add_segment_materials(segment)
+        return self
+
+    def add_segments(self, segments: Iterable[Union[VideoSegment, StickerSegment, AudioSegment, TextSegment]],
+                     track_name: Optional[str] = None) -> "ScriptFile":
+        """向指定轨道中批量添加同类型的片段, 轨道只查找一次
+
+        Args:
+            segments (`Iterable`): 要添加的片段, 类型需一致
+            track_name (`str`, optional): 添加到的轨道名称. 当此类型的轨道仅有一条时可省略.
+
+        Raises:
+            `NameError`: 未找到指定名称的轨道, 或必须提供`track_name`参数时未提供
+            `TypeError`: 片段类型不匹配轨道类型
+            `SegmentOverlap`: 新片段与已有片段或其它新片段重叠
+        """
+        segments = list(segments)
+        if not segments:
+            return self
+        target = self._get_track(type(segments[0]), track_name)
+
+        # 加入轨道并更新时长
+        target.add_segments(segments)
+        self.duration = max(self.duration, max(segment.end for segment in segments))
+
+        for segment in segments:
+            self._add_segment_materials(segment)
+        return self
+
+    def _add_segment_materials(self, segment: Union[VideoSegment, StickerSegment, AudioSegment, TextSegment]) -> None:
+        """自动添加片段相关的素材"""
         if isinstance(segment, VideoSegment):
             # 出入场等动画
             if (segment.animations_instance is not None) and (segment.animations_instance not in self.materials):
@@ -353,8 +392,6 @@ class ScriptFile:
         if isinstance(segment, (VideoSegment, AudioSegment)):
             self.add_material(segment.material_instance)
 
-        return self
-
     def add_effect(self, effect: Union[VideoSceneEffectType, VideoCharacterEffectType],
                    t_range: Timerange, track_name: Optional[str] = None, *,
                    params: Optional[List[Optional[float]]] = None) -> "ScriptFile":
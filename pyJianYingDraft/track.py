@@ -4,7 +4,7 @@ import uuid
 
 from enum import Enum
 from typing import TypeVar, Generic, Type
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Union, Iterable
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
@@ -121,6 +121,41 @@ class Track(BaseTrack, Generic[Seg_type]):
         self.segments.append(segment)
         return self
 
+    def add_segments(self, segments: Iterable[Seg_type]) -> "Track[Seg_type]":
+        """向轨道中批量添加片段, 全部检查通过后才一次性加入
+
+        Args:
+            segments (Iterable[Seg_type]): 要添加的片段
+
+        Raises:
+            `TypeError`: 新片段类型与轨道类型不匹配
+            `SegmentOverlap`: 新片段与现有片段或其它新片段重叠
+        """
+        new_segments = list(segments)
+        for segment in new_segments:
+            if not isinstance(segment, self.accept_segment_type):
+                raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (type(segment), self.accept_segment_type))
+
+        # 按起止时间排序后扫描, 每个片段只需与之前结束最晚的片段比较
+        # 起止时间预先取出为元组排序, 序号不小于existing_count的为新片段
+        existing_count = len(self.segments)
+        entries = [(seg.target_timerange.start, seg.target_timerange.end, i)
+                   for i, seg in enumerate(self.segments + new_segments)]
+        entries.sort()
+        latest_start = latest_end = latest_index = None
+        for start, end, index in entries:
+            if latest_index is not None and latest_end > start and end > latest_start \
+                    and (index >= existing_count or latest_index >= existing_count):
+                new_index = index if index >= existing_count else latest_index
+                new_seg = new_segments[new_index - existing_count]
+                raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
+                                     .format(new_seg.target_timerange.start, new_seg.target_timerange.end))
+            if latest_index is None or end > latest_end:
+                latest_start, latest_end, latest_index = start, end, index
+
+        self.segments.extend(new_segments)
+        return self
+
     def export_json(self) -> Dict[str, Any]:
         # 为每个片段写入render_index
         segment_exports = [seg.export_json() for seg in self.segments]
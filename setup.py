@@ -21,6 +21,7 @@ setup(
     install_requires=[
         "pymediainfo",
         "imageio",
+        "numpy",
         "uiautomation>=2; sys_platform == 'win32'"
     ],
 )
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试素材下载缓存：远端未变化的URL复用已下载文件，变化后重新下载
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import functools
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow.core.base import WorkflowContext
+from workflow.managers.material_manager import MaterialManager
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    """统计GET请求次数的静态文件服务"""
+    get_count = 0
+
+    def do_GET(self):
+        type(self).get_count += 1
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+def test_unchanged_url_is_not_downloaded_again():
+    """同一URL远端未变化时只下载一次，内容变化后重新下载"""
+    with tempfile.TemporaryDirectory() as root:
+        serve_dir = os.path.join(root, 'srv')
+        os.makedirs(serve_dir)
+        source = os.path.join(serve_dir, 'clip.bin')
+        with open(source, 'wb') as f:
+            f.write(b'a' * 1000)
+
+        handler = functools.partial(_CountingHandler, directory=serve_dir)
+        _CountingHandler.get_count = 0
+        server = HTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/clip.bin"
+            manager = MaterialManager(WorkflowContext())
+
+            first = manager.fetch_material(url, os.path.join(root, 'out', 'first.bin'))
+            second = manager.fetch_material(url, os.path.join(root, 'out', 'second.bin'))
+            assert first == (os.path.join(root, 'out', 'first.bin'), 1000)
+            assert second == first
+            assert _CountingHandler.get_count == 1
+
+            with open(source, 'wb') as f:
+                f.write(b'b' * 2000)
+            third = manager.fetch_material(url, os.path.join(root, 'out', 'third.bin'))
+            assert third == (os.path.join(root, 'out', 'third.bin'), 2000)
+            assert _CountingHandler.get_count == 2
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    print("测试素材下载缓存...")
+    test_unchanged_url_is_not_downloaded_again()
+    print("🎉 测试通过！")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试SRT字幕解析：空文本的字幕块不会吞掉下一条字幕
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow.processors.subtitle_processor import load_srt
+
+def _parse(data: bytes):
+    """把SRT内容写入临时文件后解析"""
+    fd, path = tempfile.mkstemp(suffix='.srt')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return load_srt(path)
+    finally:
+        os.unlink(path)
+
+def test_empty_cue_keeps_next_cue():
+    """空文本字幕块后的字幕仍被单独解析"""
+    segments = _parse(b"1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nX")
+    assert segments == [
+        {'text': '', 'start_time': 1.0, 'end_time': 2.0},
+        {'text': 'X', 'start_time': 3.0, 'end_time': 4.0},
+    ]
+
+def test_multiline_and_crlf_cues():
+    """多行文本、CRLF换行、BOM和结尾空行均能正确解析"""
+    segments = _parse(
+        b"\xef\xbb\xbf1\r\n00:00:00,500 --> 00:00:01,250\r\n\xe4\xbd\xa0\xe5\xa5\xbd\r\nworld\r\n\r\n"
+        b"2\r\n00:00:02.000 --> 00:00:03.000\r\n\r\n"
+        b"3\r\n00:01:00,000 --> 00:01:01,000\r\nend\r\n\r\n"
+    )
+    assert segments == [
+        {'text': '你好\nworld', 'start_time': 0.5, 'end_time': 1.25},
+        {'text': '', 'start_time': 2.0, 'end_time': 3.0},
+        {'text': 'end', 'start_time': 60.0, 'end_time': 61.0},
+    ]
+
+if __name__ == "__main__":
+    print("测试SRT字幕解析...")
+    test_empty_cue_keeps_next_cue()
+    test_multiline_and_crlf_cues()
+    print("🎉 测试通过！")
@@ -2238,6 +2238,7 @@ class VideoEditingWorkflow:
                 - subtitle_speed: 字幕速度系数，>1加快，<1减慢 (默认1.0)
                 - background_music_path: 背景音乐文件路径 (可选)
                 - background_music_volume: 背景音乐音量 (默认0.3)
+                - http_session: ASR和豆包请求共用的 requests.Session (可选)
             time_offset: 前置时间差（秒），主片段整体往后迁移的时间 (默认0.0)
             template_config: 模板配置，包含标题、字幕、封面等样式配置
                 
@@ -2294,7 +2295,8 @@ class VideoEditingWorkflow:
                 appid=volcengine_appid, 
                 access_token=volcengine_access_token,
                 doubao_token=doubao_token,
-                doubao_model=doubao_model
+                doubao_model=doubao_model,
+                session=inputs.get('http_session')
             )
             print(f"[OK] 火山引擎ASR已初始化 (AppID: {volcengine_appid})")
             if doubao_token:
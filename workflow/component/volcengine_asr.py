@@ -14,7 +14,8 @@ from typing import Dict, Any, List, Optional
 class VolcengineASR:
     """火山引擎语音识别客户端"""
     
-    def __init__(self, appid: str, access_token: str, doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115"):
+    def __init__(self, appid: str, access_token: str, doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115",
+                 session: Optional[requests.Session] = None):
         """初始化火山引擎ASR客户端
         
         Args:
@@ -22,6 +23,7 @@ class VolcengineASR:
             access_token: 火山引擎ASR访问令牌
             doubao_token: 豆包API访问令牌（用于关键词提取）
             doubao_model: 豆包模型名称，默认为doubao-1-5-pro-32k-250115
+            session: 共用的HTTP会话，不传时自行创建；提交、轮询和关键词提取复用同一连接池
         """
         # 火山引擎ASR配置
         self.base_url = 'https://openspeech.bytedance.com/api/v1/vc'
@@ -32,6 +34,9 @@ class VolcengineASR:
         self.doubao_token = doubao_token
         self.doubao_model = doubao_model
         
+        # HTTP会话，避免每次请求重新建立TCP+TLS连接
+        self.session = session if session is not None else requests.Session()
+        
     def submit_audio_file(self, file_url: str, language: str = 'zh-CN') -> Optional[str]:
         """提交音频文件进行识别
         
@@ -45,7 +50,7 @@ class VolcengineASR:
         print(f"[INFO] 提交音频文件进行识别: {file_url}")
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/submit',
                 params={
                     'appid': self.appid,
@@ -91,7 +96,7 @@ class VolcengineASR:
             识别结果，失败返回None
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_url}/query',
                 params={
                     'appid': self.appid,
@@ -301,7 +306,7 @@ class VolcengineASR:
                 return self._fallback_keyword_extraction(text, max_keywords)
             
             # 豆包API进行智能关键词提取（用户注意力优化版本）
-            response = requests.post(
+            response = self.session.post(
                 'https://ark.cn-beijing.volces.com/api/v3/chat/completions',
                 headers={
                     'Content-Type': 'application/json',
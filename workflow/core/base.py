@@ -4,17 +4,30 @@
 定义所有处理器的基类和工作流上下文
 """
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from array import array
+from functools import cache, cached_property
+from typing import TYPE_CHECKING, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
 import pyJianYingDraft as draft
 
+if TYPE_CHECKING:
+    from ..managers import MaterialManager, DurationManager, TrackManager
+
+@cache
+def _managers():
+    """管理器模块依赖本模块，无法在顶层导入；首次使用时导入一次并缓存"""
+    from .. import managers
+    return managers
+
 @dataclass
 class WorkflowContext:
     """工作流上下文，存储共享状态"""
     script: Optional[draft.ScriptFile] = None
-    audio_duration: float = 0.0
-    video_duration: float = 0.0 
+    # 音视频时长以整数微秒存储，audio_duration/video_duration 属性按需换算为秒
+    audio_duration_us: int = 0
+    video_duration_us: int = 0
     project_duration: float = 0.0
     
     # 字幕相关
@@ -28,16 +41,83 @@ class WorkflowContext:
     digital_video_path: Optional[str] = None
     material_video_path: Optional[str] = None
     
+    # 轨道片段时间（SoA布局）：轨道名 -> (起始时间数组, 结束时间数组)，单位为微秒
+    segment_times: Dict[str, Tuple[array, array]] = field(default_factory=dict)
+    
+    # 已确认存在的轨道名，仅对记录时的草稿有效
+    known_tracks: Set[str] = field(default_factory=set)
+    _known_tracks_script: Optional[draft.ScriptFile] = field(default=None, repr=False)
+    
+    def _sync_known_tracks(self):
+        """草稿被替换后轨道记录和片段时间记录失效"""
+        if self.script is not self._known_tracks_script:
+            self._known_tracks_script = self.script
+            self.known_tracks.clear()
+            self.segment_times.clear()
+    
+    def is_known_track(self, track_name: str) -> bool:
+        """轨道是否已确认存在于当前草稿中"""
+        self._sync_known_tracks()
+        return track_name in self.known_tracks
+        
+    def mark_track_known(self, track_name: str):
+        """记录轨道已存在于当前草稿中"""
+        self._sync_known_tracks()
+        self.known_tracks.add(track_name)
+    
+    def record_segment_time(self, track_name: str, start_us: int, end_us: int):
+        """记录轨道中一个片段的起止时间（微秒）"""
+        self._sync_known_tracks()
+        times = self.segment_times.get(track_name)
+        if times is None:
+            times = self.segment_times[track_name] = (array('q'), array('q'))
+        times[0].append(start_us)
+        times[1].append(end_us)
+        
+    def get_segment_times(self, track_name: str) -> Optional[Tuple[array, array]]:
+        """获取当前草稿中轨道的片段起止时间记录，没有记录时返回None"""
+        self._sync_known_tracks()
+        return self.segment_times.get(track_name)
+        
+    def clear_segment_times(self, track_name: str):
+        """清除轨道的片段时间记录"""
+        self.segment_times.pop(track_name, None)
+    
+    @property
+    def audio_duration(self) -> float:
+        """音频时长(秒)"""
+        return self.audio_duration_us / 1000000
+        
+    @audio_duration.setter
+    def audio_duration(self, seconds: float):
+        self.audio_duration_us = int(round(seconds * 1000000))
+        
+    @property
+    def video_duration(self) -> float:
+        """视频时长(秒)"""
+        return self.video_duration_us / 1000000
+        
+    @video_duration.setter
+    def video_duration(self, seconds: float):
+        self.video_duration_us = int(round(seconds * 1000000))
+        
     def get_effective_video_duration(self) -> float:
-        """获取有效视频时长"""
-        if hasattr(self, 'adjusted_subtitles') and self.adjusted_subtitles and self.video_duration > 0:
+        """获取有效视频时长（依次取视频、音频、项目时长中第一个大于0的值）"""
+        if self.video_duration_us > 0:
             return self.video_duration
-        elif self.video_duration > 0:
-            return self.video_duration
-        elif self.audio_duration > 0:
+        elif self.audio_duration_us > 0:
             return self.audio_duration
         else:
             return self.project_duration
+            
+    def get_effective_video_duration_us(self) -> int:
+        """获取有效视频时长（整数微秒），取值规则同 get_effective_video_duration"""
+        if self.video_duration_us > 0:
+            return self.video_duration_us
+        elif self.audio_duration_us > 0:
+            return self.audio_duration_us
+        else:
+            return int(round(self.project_duration * 1000000))
 
 class BaseProcessor(ABC):
     """所有处理器的基类"""
@@ -46,17 +126,37 @@ class BaseProcessor(ABC):
         self.context = context
         self.logger = logger
         
+    # 管理器按处理器实例延迟构造一次，避免在热路径中重复导入和实例化
+    @cached_property
+    def material_manager(self) -> "MaterialManager":
+        return _managers().MaterialManager(self.context, self.logger)
+        
+    @cached_property
+    def duration_manager(self) -> "DurationManager":
+        return _managers().DurationManager(self.context, self.logger)
+        
+    @cached_property
+    def track_manager(self) -> "TrackManager":
+        return _managers().TrackManager(self.context, self.logger)
+        
     @abstractmethod
     def process(self, *args, **kwargs) -> Any:
         """处理方法，子类必须实现"""
         pass
         
-    def _log(self, level: str, message: str):
-        """统一的日志记录方法"""
+    def _log(self, level: str, message: str, *args):
+        """统一的日志记录方法，传入args时按%格式延迟到实际输出时才格式化"""
         if self.logger:
-            getattr(self.logger, level.lower())(message)
+            getattr(self.logger, level.lower())(message, *args)
         else:
-            print(f"[{level.upper()}] {message}")
+            print(f"[{level.upper()}] {message % args if args else message}")
+            
+    def _debug_enabled(self) -> bool:
+        """调试日志是否会被输出，用于跳过只为调试日志准备数据的开销"""
+        if not self.logger:
+            return True
+        is_enabled_for = getattr(self.logger, 'isEnabledFor', None)
+        return is_enabled_for is None or is_enabled_for(logging.DEBUG)
             
     def _format_duration(self, duration: float, precision: int = 2) -> str:
         """格式化时长显示"""
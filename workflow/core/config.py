@@ -39,6 +39,8 @@ class WorkflowConfig:
     volcengine_access_token: Optional[str] = None
     doubao_token: Optional[str] = None
     doubao_model: str = "doubao-1-5-pro-32k-250115"
+    # ASR结果磁盘缓存目录（如 ~/.cache/pyJianYingDraft/asr），为None时不缓存转录结果
+    asr_cache_dir: Optional[str] = None
     
     # 时长设置
     duration_precision: int = 2  # 时长显示精度
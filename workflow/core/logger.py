@@ -54,21 +54,25 @@ class WorkflowLogger:
         self.info(f"🚀 视频编辑工作流开始 - 项目: {self.project_name}")
         self.info(f"📝 日志保存至: {self.log_filename}")
         
-    def debug(self, message: str):
+    def isEnabledFor(self, level: int) -> bool:
+        """判断指定级别的日志是否会被输出"""
+        return self.logger.isEnabledFor(level)
+        
+    def debug(self, message: str, *args):
         """调试日志"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
         
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """信息日志"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
         
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """警告日志"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
         
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """错误日志"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
         
     def save_summary(self, summary_data: dict):
         """保存工作流摘要"""
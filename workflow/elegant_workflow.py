@@ -7,6 +7,7 @@
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
 # 添加本地 pyJianYingDraft 模块路径
@@ -63,6 +64,13 @@ class ElegantVideoWorkflow:
         self.subtitle_processor = SubtitleProcessor(self.context, self.logger)
         self.pause_processor = PauseProcessor(self.context, self.logger)
         
+        # 处理器共用工作流的管理器实例，不再各自构造
+        for processor in (self.audio_processor, self.video_processor, self.subtitle_processor, self.pause_processor):
+            processor.duration_manager = self.duration_manager
+            processor.track_manager = self.track_manager
+            processor.material_manager = self.material_manager
+        self.audio_processor.asr_cache_dir = config.asr_cache_dir
+        
         # 初始化草稿文件夹
         self.draft_folder = draft.DraftFolder(config.draft_folder_path)
         
@@ -139,9 +147,11 @@ class ElegantVideoWorkflow:
         return self.pause_processor.apply_natural_pauses(asr_result, **kwargs)
     
     def initialize_asr(self, volcengine_appid: str, volcengine_access_token: str,
-                       doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115"):
-        """初始化ASR功能"""
-        self.audio_processor.initialize_asr(volcengine_appid, volcengine_access_token, doubao_token, doubao_model)
+                       doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115",
+                       http_session: Optional[Any] = None):
+        """初始化ASR功能，http_session 为ASR和豆包请求共用的 requests.Session"""
+        self.audio_processor.initialize_asr(volcengine_appid, volcengine_access_token, doubao_token, doubao_model,
+                                            http_session=http_session)
         self.logger.info(f"🔥 火山引擎ASR已在优雅工作流中初始化")
     
     def transcribe_audio_and_generate_subtitles(self, audio_url: str) -> List[Dict[str, Any]]:
@@ -180,6 +190,7 @@ class ElegantVideoWorkflow:
                 - volcengine_access_token: 火山引擎ASR AccessToken（必需）
                 - doubao_token: 豆包API Token（用于关键词提取）
                 - doubao_model: 豆包模型名称
+                - http_session: ASR和豆包请求共用的 requests.Session（可选）
                 - subtitle_delay: 字幕延迟（秒），正值延后，负值提前
                 - subtitle_speed: 字幕速度系数，>1加快，<1减慢
                 - remove_pauses: 是否移除音频停顿
@@ -209,26 +220,40 @@ class ElegantVideoWorkflow:
             doubao_token = inputs.get('doubao_token')
             doubao_model = inputs.get('doubao_model', 'doubao-1-5-pro-32k-250115')
             
-            self.initialize_asr(volcengine_appid, volcengine_access_token, doubao_token, doubao_model)
+            # 网络素材互不依赖，先在后台并发下载，后续添加素材时直接使用下载结果
+            digital_human_url = inputs.get('digital_human_url')
+            video_url = inputs.get('video_url')
+            self.material_manager.prefetch([
+                (digital_human_url, self.material_manager.generate_unique_filename("digital_human", ".mp4")),
+                (video_url, self.material_manager.generate_unique_filename("video", ".mp4")),
+                (audio_url, self.material_manager.generate_unique_filename("audio", ".mp3")),
+            ])
+            
+            self.initialize_asr(volcengine_appid, volcengine_access_token, doubao_token, doubao_model,
+                                http_session=inputs.get('http_session'))
+            
+            # 转录只依赖音频URL，与草稿创建和视频添加互不影响，在后台线程中先行开始
+            self.logger.info("🎤 开始音频转录生成字幕")
+            asr_executor = ThreadPoolExecutor(max_workers=1)
+            asr_future = asr_executor.submit(self.transcribe_audio_and_generate_subtitles, audio_url)
+            # 不等待转录完成，线程在转录结束后自行退出
+            asr_executor.shutdown(wait=False)
             
             # 1. 创建草稿
             self.create_draft()
             
             # 2. 添加数字人视频（如果有）
-            digital_human_url = inputs.get('digital_human_url')
             if digital_human_url:
                 self.logger.info(f"🤖 添加数字人视频: {digital_human_url}")
                 self.add_digital_human_video(digital_human_url)
             
             # 3. 添加主视频（如果有）
-            video_url = inputs.get('video_url')
             if video_url:
                 self.logger.info(f"🎬 添加主视频: {video_url}")
                 self.add_video(video_url)
             
-            # 4. 进行音频转录生成字幕
-            self.logger.info("🎤 开始音频转录生成字幕")
-            subtitle_objects = self.transcribe_audio_and_generate_subtitles(audio_url)
+            # 4. 等待音频转录结果
+            subtitle_objects = asr_future.result()
             
             if not subtitle_objects:
                 raise WorkflowError("音频转录失败，无法生成字幕")
@@ -4,6 +4,7 @@
 负责所有时长相关的计算、验证和格式化
 """
 
+import numpy as np
 from typing import Optional
 from ..core.base import BaseProcessor, WorkflowContext
 from ..core.exceptions import DurationError
@@ -15,24 +16,29 @@ class DurationManager(BaseProcessor):
         """占位方法"""
         pass
         
-    def validate_duration_bounds(self, duration: float, context: str = "") -> float:
+    def get_max_allowed_duration(self) -> float:
+        """获取最大允许时长（优先使用有效视频时长，其次项目时长），没有参考时返回0"""
+        max_allowed_duration = self.context.get_effective_video_duration()
+        if max_allowed_duration <= 0:
+            max_allowed_duration = self.context.project_duration
+        return max_allowed_duration
+        
+    def validate_duration_bounds(self, duration: float, context: str = "",
+                                 max_allowed_duration: Optional[float] = None) -> float:
         """验证时长边界，确保不超过视频总时长
         
         Args:
             duration: 需要验证的时长（秒）
             context: 上下文信息，用于调试
+            max_allowed_duration: 预先计算的最大允许时长，批量验证时传入以避免重复计算
             
         Returns:
             验证后的时长（秒），保留两位小数
         """
-        # 获取最大允许时长（优先使用有效视频时长）
-        max_allowed_duration = self.context.get_effective_video_duration()
-        
-        # 如果没有有效视频时长，使用项目时长
-        if max_allowed_duration <= 0:
-            max_allowed_duration = self.context.project_duration
+        if max_allowed_duration is None:
+            max_allowed_duration = self.get_max_allowed_duration()
             
-        # 如果仍然没有，直接返回原时长
+        # 如果没有时长参考，直接返回原时长
         if max_allowed_duration <= 0:
             self._log("warning", f"{context}无法验证时长边界，因为没有视频时长参考")
             return round(duration, 2)
@@ -42,12 +48,41 @@ class DurationManager(BaseProcessor):
             self._log("warning", f"{context}时长 {duration:.2f}s 超过最大允许时长 {max_allowed_duration:.2f}s，将被截取")
             return round(max_allowed_duration, 2)
         else:
-            self._log("debug", f"{context}时长 {duration:.2f}s 在允许范围内 (最大: {max_allowed_duration:.2f}s)")
+            self._log("debug", "%s时长 %.2fs 在允许范围内 (最大: %.2fs)", context, duration, max_allowed_duration)
             return round(duration, 2)
             
+    def validate_duration_bounds_array(self, durations: np.ndarray, context: str = "") -> np.ndarray:
+        """批量验证时长边界，与 validate_duration_bounds 规则一致但一次处理整个数组
+        
+        Args:
+            durations: 需要验证的时长数组（秒）
+            context: 上下文信息，用于调试
+            
+        Returns:
+            验证后的时长数组（秒），未做舍入
+        """
+        max_allowed_duration = self.get_max_allowed_duration()
+        if max_allowed_duration <= 0:
+            self._log("warning", f"{context}无法验证时长边界，因为没有视频时长参考")
+            return durations
+            
+        exceeded = int(np.count_nonzero(durations > max_allowed_duration))
+        if exceeded:
+            self._log("warning", f"{context}有 {exceeded} 个时长超过最大允许时长 {max_allowed_duration:.2f}s，将被截取")
+        return np.minimum(durations, max_allowed_duration)
+        
+    def get_track_end(self, track_name: str) -> float:
+        """获取轨道中已记录片段的最大结束时间（秒），没有记录时返回0"""
+        times = self.context.get_segment_times(track_name)
+        if not times or not times[1]:
+            return 0.0
+        # array('q') 可零拷贝地视为 int64 数组，直接做向量化求最大值
+        return int(np.frombuffer(times[1], dtype=np.int64).max()) / 1000000
+        
     def update_project_duration(self):
         """更新项目总时长，取音视频中的最长者"""
-        self.context.project_duration = round(max(self.context.audio_duration, self.context.video_duration), 6)
+        track_end = max(self.get_track_end("音频轨道"), self.get_track_end("主视频轨道"))
+        self.context.project_duration = round(max(self.context.audio_duration, self.context.video_duration, track_end), 6)
         if self.context.project_duration > 0:
             self._log("info", f"项目总时长更新为: {self.context.project_duration:.6f} 秒 (音频: {self.context.audio_duration:.6f}s, 视频: {self.context.video_duration:.6f}s)")
             
@@ -5,16 +5,57 @@
 """
 
 import os
-import requests
+import functools
 import tempfile
-import uuid
+import itertools
 import time
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 from ..core.base import BaseProcessor, WorkflowContext
 
+# 下载时每次读取的块大小
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 预下载的最大并发数
+_PREFETCH_WORKERS = 4
+
+# 进程级文件名序号与时间戳：同一进程内用单调计数器保证唯一，时间戳用于区分不同进程
+_filename_counter = itertools.count()
+_process_stamp = f"{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+@functools.lru_cache(maxsize=256)
+def _get_material(material_cls: type, path: str, mtime_ns: int, size: int) -> Any:
+    """按 (素材类型, 路径, 修改时间, 文件大小) 缓存素材，同一文件只解析一次"""
+    return material_cls(path)
+
+def load_material(material_cls: type, path: str) -> Any:
+    """获取音视频素材实例，文件未变化时复用已解析的实例
+    
+    Args:
+        material_cls: 素材类型，如 draft.AudioMaterial、draft.VideoMaterial
+        path: 本地文件路径
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _get_material(material_cls, path, st.st_mtime_ns, st.st_size)
+
+def _get_requests():
+    """延迟导入requests，纯本地素材的工作流无需加载网络库"""
+    import requests
+    return requests
+
 class MaterialManager(BaseProcessor):
     """素材管理器"""
     
+    def __init__(self, context: WorkflowContext, logger: Any = None):
+        super().__init__(context, logger)
+        # 已确认存在的临时目录，避免每次生成文件名都调用 os.makedirs
+        self._created_temp_dirs: Set[str] = set()
+        # 已下载的URL -> (本地路径, 文件大小, ETag, Last-Modified)，远端未变化时复用本地文件
+        self._url_cache: Dict[str, Tuple[str, int, Optional[str], Optional[str]]] = {}
+        # 正在后台预下载的URL -> 下载结果
+        self._prefetched: Dict[str, Future] = {}
+        
     def process(self, *args, **kwargs):
         """占位方法"""  
         pass
@@ -23,34 +64,138 @@ class MaterialManager(BaseProcessor):
         """下载网络素材到本地
         
         Args:
-            url: 素材URL
+            url: 素材URL或本地路径（支持 pathlib.Path）
             local_path: 本地保存路径
             
         Returns:
             本地文件路径（如果下载成功）或原始URL（如果下载失败）
         """
-        if not url or url.startswith('file://') or os.path.exists(url):
-            return url
+        return self.fetch_material(url, local_path)[0]
+        
+    def fetch_material(self, url: str, local_path: str) -> Tuple[str, Optional[int]]:
+        """下载网络素材到本地，同时返回文件大小
+        
+        大小在下载过程中逐块累计，调用方无需再 stat。
+        
+        Args:
+            url: 素材URL或本地路径（支持 pathlib.Path）
+            local_path: 本地保存路径
+            
+        Returns:
+            (路径, 文件大小)；未发生下载时大小为None
+        """
+        if not url:
+            return url, None
+        url = os.fspath(url)
+        
+        # 非HTTP地址（本地路径、file:// 等）直接返回，无需触碰网络库
+        if not url.startswith(('http://', 'https://')):
+            return url, None
+            
+        # 已在后台预下载的素材直接等待其结果
+        future = self._prefetched.pop(url, None)
+        if future is not None:
+            return future.result()
+        return self._download_material(url, local_path)
+        
+    def _download_material(self, url: str, local_path: str) -> Tuple[str, Optional[int]]:
+        """实际执行HTTP下载，不读写预下载表，可在后台线程中调用
+        
+        之前下载过且远端未变化的URL直接返回已下载的文件。
+        """
+        cached = self._get_cached_download(url)
+        if cached is not None:
+            return cached
             
         try:
-            self._log("debug", f"尝试下载: {url} -> {local_path}")
-            response = requests.get(url, stream=True)
+            self._log("debug", "尝试下载: %s -> %s", url, local_path)
+            response = _get_requests().get(url, stream=True)
             response.raise_for_status()
             
             # 确保目录存在
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
             
+            size = 0
             with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
+                for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
                     f.write(chunk)
+                    size += len(chunk)
+            
+            headers = response.headers
+            self._url_cache[url] = (local_path, size, headers.get('ETag'), headers.get('Last-Modified'))
+            self._log("debug", "下载成功: %s", local_path)
+            return local_path, size
+        except Exception as e:
+            self._log("debug", "下载失败: %s, 错误: %s", url, e)
+            # 删除下载中断留下的不完整文件
+            try:
+                os.unlink(local_path)
+            except OSError:
+                pass
+            self._log("debug", "返回原始URL: %s", url)
+            return url, None  # 返回原URL，让用户处理
+            
+    def prefetch(self, items: Iterable[Tuple[str, str]]) -> Dict[str, Future]:
+        """在后台并发下载多个网络素材，之后对同一URL的 download_material/fetch_material 调用直接使用下载结果
+        
+        Args:
+            items: (URL, 本地保存路径) 序列，非HTTP地址和重复的URL会被忽略
+            
+        Returns:
+            本次提交的 URL -> Future 映射
+        """
+        urls = {}
+        for url, local_path in items:
+            if not url:
+                continue
+            url = os.fspath(url)
+            if url.startswith(('http://', 'https://')) and url not in self._prefetched and url not in urls:
+                urls[url] = local_path
+        if not urls:
+            return {}
             
-            self._log("debug", f"下载成功: {local_path}")
-            return local_path
+        executor = ThreadPoolExecutor(max_workers=min(_PREFETCH_WORKERS, len(urls)))
+        futures = {url: executor.submit(self._download_material, url, local_path) for url, local_path in urls.items()}
+        # 不等待任务完成，线程在下载结束后自行退出
+        executor.shutdown(wait=False)
+        self._prefetched.update(futures)
+        self._log("debug", "开始预下载 %d 个素材", len(futures))
+        return futures
+        
+    def _get_cached_download(self, url: str) -> Optional[Tuple[str, int]]:
+        """返回之前下载且远端未变化的本地文件，需要重新下载时返回None
+        
+        本地文件须仍存在且大小一致，再用HEAD请求比较ETag，没有ETag时比较Last-Modified和Content-Length。
+        """
+        entry = self._url_cache.get(url)
+        if entry is None:
+            return None
+        path, size, etag, last_modified = entry
+        try:
+            if os.path.getsize(path) != size:
+                return None
+            response = _get_requests().head(url, allow_redirects=True, timeout=10)
+            response.raise_for_status()
         except Exception as e:
-            self._log("debug", f"下载失败: {url}, 错误: {e}")
-            self._log("debug", f"返回原始URL: {url}")
-            return url  # 返回原URL，让用户处理
+            self._log("debug", "缓存校验失败，重新下载: %s, 错误: %s", url, e)
+            return None
             
+        headers = response.headers
+        remote_length = headers.get('Content-Length')
+        if remote_length is not None and remote_length != str(size):
+            return None
+        if etag is not None:
+            unchanged = headers.get('ETag') == etag
+        elif last_modified is not None:
+            unchanged = headers.get('Last-Modified') == last_modified
+        else:
+            unchanged = remote_length is not None
+        if not unchanged:
+            return None
+            
+        self._log("debug", "素材未变化，复用已下载文件: %s", path)
+        return path, size
+        
     def generate_unique_filename(self, prefix: str, extension: str = ".mp4") -> str:
         """生成唯一的文件名，避免不同项目之间的文件冲突
         
@@ -61,19 +206,22 @@ class MaterialManager(BaseProcessor):
         Returns:
             唯一的文件路径
         """
-        # 使用时间戳和UUID生成唯一文件名
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]  # 使用UUID的前8位
-        filename = f"{prefix}_{timestamp}_{unique_id}{extension}"
+        # 使用进程时间戳和单调计数器生成唯一文件名
+        filename = f"{prefix}_{_process_stamp}_{next(_filename_counter):08d}{extension}"
         
         # 确保temp_materials目录存在
-        os.makedirs("temp_materials", exist_ok=True)
+        self.ensure_temp_dir("temp_materials")
         
         return f"temp_materials/{filename}"
         
     def ensure_temp_dir(self, temp_dir: str = "temp_materials"):
         """确保临时目录存在"""
-        os.makedirs(temp_dir, exist_ok=True)
+        # 以绝对路径为键，工作目录切换后仍能正确判断
+        abs_dir = os.path.abspath(temp_dir)
+        if abs_dir in self._created_temp_dirs:
+            return
+        os.makedirs(abs_dir, exist_ok=True)
+        self._created_temp_dirs.add(abs_dir)
         
     def cleanup_temp_files(self, file_paths: list):
         """清理临时文件"""
@@ -81,6 +229,6 @@ class MaterialManager(BaseProcessor):
             try:
                 if os.path.exists(file_path) and file_path.startswith("temp_materials/"):
                     os.unlink(file_path)
-                    self._log("debug", f"清理临时文件: {file_path}")
+                    self._log("debug", "清理临时文件: %s", file_path)
             except Exception as e:
                 self._log("warning", f"清理临时文件失败 {file_path}: {e}")
\ No newline at end of file
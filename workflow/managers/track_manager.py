@@ -6,6 +6,7 @@
 
 import pyJianYingDraft as draft
 from pyJianYingDraft import TrackType
+from typing import Any, List
 from ..core.base import BaseProcessor, WorkflowContext
 
 class TrackManager(BaseProcessor):
@@ -37,17 +38,30 @@ class TrackManager(BaseProcessor):
         if not self.context.script:
             return False
             
-        try:
-            _ = self.context.script.tracks[track_name]
+        # 同一草稿中已确认过的轨道不再重复检查
+        if self.context.is_known_track(track_name):
             return True
-        except KeyError:
+            
+        if track_name not in self.context.script.tracks:
             # 计算下一个可用的相对索引
-            existing_tracks = [name for name in self.context.script.tracks.keys() 
-                             if self.context.script.tracks[name].track_type == track_type]
-            next_index = len(existing_tracks) + 1
-            self.context.script.add_track(track_type, track_name, relative_index=next_index)
+            existing_count = len(self.context.script.get_tracks_by_type(track_type))
+            self.context.script.add_track(track_type, track_name, relative_index=existing_count + 1)
             self._log("info", f"创建新轨道: {track_name}")
-            return True
+        self.context.mark_track_known(track_name)
+        return True
+            
+    def add_segment(self, segment, track_name: str):
+        """添加片段到轨道，并同步记录片段时间供时长计算使用"""
+        self.context.script.add_segment(segment, track_name=track_name)
+        time_range = segment.target_timerange
+        self.context.record_segment_time(track_name, time_range.start, time_range.end)
+        
+    def add_segments(self, segments: List[Any], track_name: str):
+        """批量添加片段到轨道，轨道只查找一次"""
+        self.context.script.add_segments(segments, track_name=track_name)
+        for segment in segments:
+            time_range = segment.target_timerange
+            self.context.record_segment_time(track_name, time_range.start, time_range.end)
             
     def clear_track_segments(self, track_name: str):
         """清理轨道中的段"""
@@ -56,10 +70,13 @@ class TrackManager(BaseProcessor):
             
         try:
             track = self.context.script.tracks[track_name]
-            if hasattr(track, 'segments') and track.segments:
-                self._log("debug", f"清理轨道 '{track_name}' 中的 {len(track.segments)} 个段")
-                track.segments.clear()
-                self._log("info", f"轨道 '{track_name}' 已清理")
+            # 首次添加素材时轨道通常为空，直接返回
+            if not track.segments:
+                return
+            self._log("debug", "清理轨道 '%s' 中的 %d 个段", track_name, len(track.segments))
+            track.segments.clear()
+            self.context.clear_segment_times(track_name)
+            self._log("info", f"轨道 '{track_name}' 已清理")
         except Exception as e:
             self._log("warning", f"清理轨道 '{track_name}' 时出错: {e}")
             
@@ -70,12 +87,9 @@ class TrackManager(BaseProcessor):
             
         try:
             # 查找所有字幕轨道
-            caption_track_names = []
-            for track_name, track in self.context.script.tracks.items():
-                if hasattr(track, 'track_type') and track.track_type == TrackType.text:
-                    caption_track_names.append(track_name)
+            caption_track_names = [track.name for track in self.context.script.get_tracks_by_type(TrackType.text)]
             
-            self._log("debug", f"找到 {len(caption_track_names)} 个字幕轨道需要清理: {caption_track_names}")
+            self._log("debug", "找到 %d 个字幕轨道需要清理: %s", len(caption_track_names), caption_track_names)
             
             # 清理每个字幕轨道中的段
             for track_name in caption_track_names:
@@ -0,0 +1,15 @@
+"""
+路径配置
+
+剪映草稿文件夹等与本机环境相关的路径，不依赖其他模块，脚本可直接导入
+"""
+
+import os
+import pathlib
+
+# 剪映草稿文件夹，只在导入时解析一次；可通过环境变量 JY_DRAFT_DIR 覆盖，
+# 默认为当前用户 %LOCALAPPDATA% 下剪映专业版的草稿目录
+DRAFT_DIR = pathlib.Path(os.environ.get('JY_DRAFT_DIR') or pathlib.Path(
+    os.environ.get('LOCALAPPDATA') or pathlib.Path.home() / 'AppData' / 'Local',
+    'JianyingPro', 'User Data', 'Projects', 'com.lveditor.draft'
+))
@@ -5,11 +5,17 @@
 """
 
 import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 import pyJianYingDraft as draft
-from pyJianYingDraft import tim, trange
 from typing import Optional, List, Dict, Any
 from ..core.base import BaseProcessor, WorkflowContext
 from ..core.exceptions import ProcessingError
+from ..managers.material_manager import load_material
+from ..utils.numeric import loop_offsets, sec_to_us, trange_us
 
 # 导入ASR相关模块
 try:
@@ -30,9 +36,42 @@ except ImportError:
         ASRBasedSilenceRemover = None
         ASRSilenceDetector = None
 
+def _file_sha256(path: str) -> str:
+    """分块计算文件内容的SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _asr_cache_key(audio_url: str, session: Any) -> Optional[str]:
+    """ASR缓存键：本地文件使用内容哈希，网络URL使用 URL + ETag/Last-Modified 的哈希
+    
+    远端文件没有版本头或HEAD请求失败时返回None，不使用缓存。
+    """
+    if os.path.isfile(audio_url):
+        return _file_sha256(audio_url)
+    try:
+        response = session.head(audio_url, allow_redirects=True, timeout=10)
+        response.raise_for_status()
+    except Exception:
+        return None
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return None
+    version = f"{audio_url}\n{etag or ''}\n{last_modified or ''}"
+    return hashlib.sha256(version.encode('utf-8')).hexdigest()
+
 class AudioProcessor(BaseProcessor):
     """音频处理器"""
     
+    # ASR结果磁盘缓存目录，默认为None不缓存；由 WorkflowConfig.asr_cache_dir 开启
+    asr_cache_dir: Optional[str] = None
+    
+    # 火山引擎ASR实例，由 initialize_asr 设置
+    volcengine_asr: Optional[Any] = None
+    
     def process(self, *args, **kwargs):
         """占位方法"""
         pass
@@ -48,30 +87,32 @@ class AudioProcessor(BaseProcessor):
         if not self.context.script:
             raise ProcessingError("请先创建草稿")
         
-        # 下载音频到本地（这里需要依赖MaterialManager）
-        from ..managers.material_manager import MaterialManager
-        material_manager = MaterialManager(self.context, self.logger)
-        
-        audio_local_path = material_manager.generate_unique_filename("audio", ".mp3")
-        local_path = material_manager.download_material(audio_url, audio_local_path)
+        # 下载音频到本地
+        audio_local_path = self.material_manager.generate_unique_filename("audio", ".mp3")
+        local_path, file_size = self.material_manager.fetch_material(audio_url, audio_local_path)
         
-        # 处理本地路径
+        # 处理本地路径：下载时已得到文件大小，否则仅在输出调试日志时才 stat
         if local_path != audio_url:
-            if not os.path.isabs(local_path):
-                local_path = os.path.abspath(local_path)
+            local_path = os.path.abspath(local_path)
             
-            if os.path.exists(local_path):
-                self._log("debug", f"本地音频文件大小: {os.path.getsize(local_path)} bytes")
-            else:
-                raise ProcessingError(f"音频文件不存在: {local_path}")
+            if file_size is None and self._debug_enabled():
+                try:
+                    file_size = os.stat(local_path).st_size
+                except OSError:
+                    raise ProcessingError(f"音频文件不存在: {local_path}")
+            if file_size is not None:
+                self._log("debug", "本地音频文件大小: %d bytes", file_size)
         
-        self._log("debug", f"最终音频路径: {local_path}")
+        self._log("debug", "最终音频路径: %s", local_path)
         
         # 获取音频素材信息
-        audio_material = draft.AudioMaterial(local_path)
-        actual_audio_duration = audio_material.duration / 1000000  # 转换为秒
+        try:
+            audio_material = load_material(draft.AudioMaterial, local_path)
+        except FileNotFoundError:
+            raise ProcessingError(f"音频文件不存在: {local_path}")
+        actual_audio_duration = audio_material.duration_seconds
         
-        self._log("debug", f"实际音频时长: {actual_audio_duration:.2f} 秒")
+        self._log("debug", "实际音频时长: %.2f 秒", actual_audio_duration)
         
         # 确定实际音频时长
         if duration is None:
@@ -90,28 +131,24 @@ class AudioProcessor(BaseProcessor):
             else:
                 actual_duration = duration
         
-        duration_microseconds = tim(f"{actual_duration:.6f}s")
-        self.context.audio_duration = round(actual_duration, 2)
+        duration_microseconds = sec_to_us(actual_duration)
+        self.context.audio_duration_us = duration_microseconds
         
         # 创建音频片段
         audio_segment = draft.AudioSegment(
             audio_material,
-            trange(tim("0s"), duration_microseconds),
+            trange_us(0, duration_microseconds),
             volume=volume
         )
         
         # 清除现有音频段以避免重叠
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.clear_track_segments("音频轨道")
+        self.track_manager.clear_track_segments("音频轨道")
         
         # 添加到音频轨道
-        self.context.script.add_segment(audio_segment, track_name="音频轨道")
+        self.track_manager.add_segment(audio_segment, "音频轨道")
         
         # 更新项目时长
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        duration_manager.update_project_duration()
+        self.duration_manager.update_project_duration()
         
         self._log("info", f"音频时长: {self.context.audio_duration:.2f} 秒")
         
@@ -131,78 +168,68 @@ class AudioProcessor(BaseProcessor):
         if not os.path.exists(music_path):
             raise ProcessingError(f"背景音乐文件不存在: {music_path}")
         
-        # 获取背景音乐素材信息
-        bg_music_material = draft.AudioMaterial(music_path)
-        
         # 确定目标时长
         if target_duration is None:
             effective_duration = self.context.get_effective_video_duration()
             if effective_duration > 0:
-                target_duration = round(effective_duration, 2)
+                target_duration = effective_duration
                 self._log("info", f"背景音乐将使用有效视频时长: {target_duration:.2f}s")
             elif self.context.video_duration > 0:
-                target_duration = round(self.context.video_duration, 2)
+                target_duration = self.context.video_duration
                 self._log("info", f"背景音乐将使用视频时长: {target_duration:.2f}s")
             elif self.context.audio_duration > 0:
-                target_duration = round(self.context.audio_duration, 2)
+                target_duration = self.context.audio_duration
                 self._log("info", f"背景音乐将使用音频时长: {target_duration:.2f}s")
             else:
                 raise ProcessingError("无法确定目标时长，请先添加音频或视频，或指定target_duration")
         else:
             # 验证用户指定的目标时长
-            from ..managers.duration_manager import DurationManager
-            duration_manager = DurationManager(self.context, self.logger)
-            target_duration = duration_manager.validate_duration_bounds(target_duration, "背景音乐")
+            target_duration = self.duration_manager.validate_duration_bounds(target_duration, "背景音乐")
         
-        target_duration_microseconds = tim(f"{target_duration:.6f}s")
-        bg_music_duration_microseconds = bg_music_material.duration
+        # 时长统一使用整数微秒计算，只在日志中换算为秒
+        target_us = sec_to_us(target_duration)
+        if target_us <= 0:
+            self._log("warning", f"背景音乐目标时长无效({target_duration:.2f}s)，跳过")
+            return
         
-        # 计算是否需要循环播放
-        bg_music_duration_seconds = bg_music_duration_microseconds / 1000000
+        # 获取背景音乐素材信息
+        bg_music_material = load_material(draft.AudioMaterial, music_path)
+        bg_us = int(bg_music_material.duration)
         
-        if bg_music_duration_seconds >= target_duration:
+        # 计算是否需要循环播放
+        if bg_us >= target_us:
             # 背景音乐够长，直接截取
             bg_music_segment = draft.AudioSegment(
                 bg_music_material,
-                trange(tim("0s"), target_duration_microseconds),
+                trange_us(0, target_us),
                 volume=volume
             )
-            self.context.script.add_segment(bg_music_segment, track_name="背景音乐轨道")
+            self.track_manager.add_segment(bg_music_segment, "背景音乐轨道")
             self._log("info", f"背景音乐已添加: {os.path.basename(music_path)}，截取时长: {target_duration:.2f}s，音量: {volume}")
         else:
             # 背景音乐太短，需要循环
-            self._log("info", f"背景音乐时长 {bg_music_duration_seconds:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
+            self._log("info", f"背景音乐时长 {bg_us / 1000000:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
             
-            # 计算需要循环的次数
-            loop_count = int(target_duration / bg_music_duration_seconds) + 1
-            current_time = 0
+            # 一次性计算所有循环段的起始时间和时长
+            starts, durations = loop_offsets(bg_us, target_us)
             
-            for i in range(loop_count):
-                # 计算当前循环的持续时间
-                remaining_time = target_duration - current_time
-                if remaining_time <= 0:
-                    break
-                    
-                current_duration = min(bg_music_duration_seconds, remaining_time)
-                
-                # 创建当前循环的音频片段
-                loop_segment = draft.AudioSegment(
+            loop_segments = [
+                draft.AudioSegment(
                     bg_music_material,
-                    trange(tim(f"{current_time:.6f}s"), tim(f"{current_duration:.6f}s")),
+                    trange_us(start_us, duration_us),
                     volume=volume
                 )
-                
-                # 添加到背景音乐轨道
-                self.context.script.add_segment(loop_segment, track_name="背景音乐轨道")
-                
-                current_time += current_duration
+                for start_us, duration_us in zip(starts.tolist(), durations.tolist())
+            ]
+            self.track_manager.add_segments(loop_segments, "背景音乐轨道")
             
-            self._log("info", f"背景音乐循环已添加: {os.path.basename(music_path)}，{loop_count}次循环，总时长: {target_duration:.2f}s，音量: {volume}")
+            self._log("info", f"背景音乐循环已添加: {os.path.basename(music_path)}，{len(starts)}次循环，总时长: {target_duration:.2f}s，音量: {volume}")
         
         return
     
     def initialize_asr(self, volcengine_appid: str = None, volcengine_access_token: str = None,
-                       doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115"):
+                       doubao_token: str = None, doubao_model: str = "doubao-1-5-pro-32k-250115",
+                       http_session: Optional[Any] = None):
         """初始化火山引擎ASR
         
         Args:
@@ -210,6 +237,7 @@ class AudioProcessor(BaseProcessor):
             volcengine_access_token: 火山引擎ASR AccessToken
             doubao_token: 豆包API Token（用于关键词提取）
             doubao_model: 豆包模型名称
+            http_session: 共用的 requests.Session，不传时由ASR客户端自行创建
         """
         if not VolcengineASR:
             raise ProcessingError("ASR模块不可用，请检查导入")
@@ -219,7 +247,8 @@ class AudioProcessor(BaseProcessor):
                 appid=volcengine_appid,
                 access_token=volcengine_access_token,
                 doubao_token=doubao_token,
-                doubao_model=doubao_model
+                doubao_model=doubao_model,
+                session=http_session
             )
             self._log("info", f"火山引擎ASR已初始化 (AppID: {volcengine_appid})")
             if doubao_token:
@@ -236,23 +265,25 @@ class AudioProcessor(BaseProcessor):
         Returns:
             字幕对象数组 [{'text': str, 'start': float, 'end': float}, ...]
         """
-        if not hasattr(self, 'volcengine_asr') or not self.volcengine_asr:
+        if not self.volcengine_asr:
             raise ProcessingError("火山引擎ASR未初始化，请先调用initialize_asr")
         
         self._log("info", f"开始音频转录: {audio_url}")
         
         try:
             # 使用火山引擎ASR进行转录
-            subtitle_objects = self.volcengine_asr.process_audio_file(audio_url)
+            subtitle_objects = self._transcribe_with_cache(
+                audio_url, "subtitles", self.volcengine_asr.process_audio_file
+            )
             
             if subtitle_objects:
                 self._log("info", f"火山引擎转录完成，生成 {len(subtitle_objects)} 段字幕")
                 
-                # 记录转录结果摘要
-                total_duration = 0
-                for subtitle in subtitle_objects:
-                    duration = subtitle['end'] - subtitle['start']
-                    total_duration += duration
+                # 记录转录结果摘要：起止时间一次性解析为数组
+                count = len(subtitle_objects)
+                starts = np.fromiter((s['start'] for s in subtitle_objects), dtype=np.float64, count=count)
+                ends = np.fromiter((s['end'] for s in subtitle_objects), dtype=np.float64, count=count)
+                total_duration = float((ends - starts).sum())
                 
                 self._log("info", f"转录统计: {len(subtitle_objects)}段, 总时长{total_duration:.1f}秒")
                 return subtitle_objects
@@ -264,6 +295,50 @@ class AudioProcessor(BaseProcessor):
             self._log("error", f"音频转录过程中出错: {e}")
             raise ProcessingError(f"音频转录失败: {e}")
     
+    def _transcribe_with_cache(self, audio_url: str, mode: str, transcribe):
+        """带磁盘缓存的ASR调用，相同音频重复运行时跳过网络请求
+        
+        Args:
+            audio_url: 音频URL（本地路径或网络URL）
+            mode: 结果类型，用于区分不同的ASR接口
+            transcribe: 实际执行转录的函数
+        """
+        if not self.asr_cache_dir:
+            return transcribe(audio_url)
+        cache_key = _asr_cache_key(audio_url, self.volcengine_asr.session)
+        if cache_key is None:
+            return transcribe(audio_url)
+            
+        cache_path = os.path.join(self.asr_cache_dir, f"{cache_key}_{mode}.json")
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            self._log("info", f"使用ASR缓存结果: {cache_path}")
+            return result
+        except (OSError, ValueError):
+            pass
+            
+        result = transcribe(audio_url)
+        if result:
+            # 先写临时文件再原子替换，避免中断时留下损坏的缓存；写入失败只视为未缓存
+            tmp_path = None
+            try:
+                os.makedirs(self.asr_cache_dir, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=self.asr_cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False)
+                os.replace(tmp_path, cache_path)
+                tmp_path = None
+            except Exception as e:
+                self._log("warning", f"写入ASR缓存失败: {e}")
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+        return result
+    
     def extract_keywords(self, text: str) -> List[str]:
         """使用AI提取关键词
         
@@ -273,7 +348,7 @@ class AudioProcessor(BaseProcessor):
         Returns:
             关键词列表
         """
-        if not hasattr(self, 'volcengine_asr') or not self.volcengine_asr:
+        if not self.volcengine_asr:
             raise ProcessingError("火山引擎ASR未初始化，请先调用initialize_asr")
         
         try:
@@ -287,6 +362,25 @@ class AudioProcessor(BaseProcessor):
             self._log("error", f"关键词提取失败: {e}")
             return []
     
+    def _discard_download(self, download_future, audio_local_path: str):
+        """放弃不再需要的音频下载：尚未开始时取消，已开始的在完成后删除本次下载写入的文件"""
+        if download_future.cancel():
+            return
+            
+        def remove_downloaded(future):
+            try:
+                path = future.result()
+            except Exception:
+                return
+            # 只删除本次写入的文件；复用的已下载文件可能仍被草稿引用
+            if path == audio_local_path:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                    
+        download_future.add_done_callback(remove_downloaded)
+        
     def remove_audio_pauses(self, audio_url: str, min_pause_duration: float = 0.2,
                            max_word_gap: float = 0.8) -> Optional[str]:
         """移除音频中的停顿
@@ -299,7 +393,7 @@ class AudioProcessor(BaseProcessor):
         Returns:
             处理后的音频文件路径，如果失败返回None
         """
-        if not hasattr(self, 'volcengine_asr') or not self.volcengine_asr:
+        if not self.volcengine_asr:
             self._log("warning", "ASR未初始化，跳过停顿移除")
             return None
         
@@ -310,34 +404,47 @@ class AudioProcessor(BaseProcessor):
         try:
             self._log("info", "开始音频停顿检测和移除...")
             
-            # 使用ASR转录音频
-            asr_result = self.volcengine_asr.transcribe_audio_for_silence_detection(audio_url)
+            # ASR转录与音频下载互不依赖，并发执行
+            audio_local_path = self.material_manager.generate_unique_filename("audio", ".mp3")
+            executor = ThreadPoolExecutor(max_workers=2)
+            asr_future = executor.submit(
+                self._transcribe_with_cache,
+                audio_url, "silence", self.volcengine_asr.transcribe_audio_for_silence_detection
+            )
+            download_future = executor.submit(
+                self.material_manager.download_material, audio_url, audio_local_path
+            )
+            # 不等待线程结束，提前返回时未用到的下载由 _discard_download 处理
+            executor.shutdown(wait=False)
+            
+            try:
+                asr_result = asr_future.result()
+                # 检测停顿
+                pause_segments = None
+                if asr_result:
+                    pause_detector = ASRSilenceDetector(min_pause_duration, max_word_gap)
+                    pause_segments = pause_detector.detect_pauses_from_asr(asr_result)
+            except Exception:
+                self._discard_download(download_future, audio_local_path)
+                raise
             
             if not asr_result:
+                self._discard_download(download_future, audio_local_path)
                 self._log("warning", "ASR转录失败，跳过停顿移除")
                 return None
             
-            # 检测停顿
-            pause_detector = ASRSilenceDetector(min_pause_duration, max_word_gap)
-            pause_segments = pause_detector.detect_pauses_from_asr(asr_result)
-            
             if not pause_segments:
+                self._discard_download(download_future, audio_local_path)
                 self._log("info", "未检测到需要移除的停顿")
                 return None
             
-            # 下载音频到本地进行处理
-            from ..managers.material_manager import MaterialManager
-            material_manager = MaterialManager(self.context, self.logger)
-            
-            audio_local_path = material_manager.generate_unique_filename("audio", ".mp3")
-            local_path = material_manager.download_material(audio_url, audio_local_path)
+            local_path = download_future.result()
             
             # 移除停顿
             silence_remover = ASRBasedSilenceRemover(min_pause_duration, max_word_gap)
             
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                output_path = temp_file.name
+            # 输出到素材目录而非系统临时目录：草稿会长期引用该文件，与下载的素材一样保留，不做自动清理
+            output_path = self.material_manager.generate_unique_filename("audio_nopause", ".mp3")
             
             result = silence_remover.remove_pauses_from_audio(
                 local_path, asr_result, output_path
@@ -4,12 +4,20 @@
 负责音频停顿相关的处理功能
 """
 
+import numpy as np
 import pyJianYingDraft as draft
 from pyJianYingDraft import tim, trange
 from typing import Optional, List, Dict, Any, Tuple
 from ..core.base import BaseProcessor, WorkflowContext
 from ..core.exceptions import ProcessingError
 
+def _to_float(value: Any) -> float:
+    """转换为浮点数，无法转换时返回NaN"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
 class PauseProcessor(BaseProcessor):
     """停顿处理器"""
     
@@ -29,9 +37,7 @@ class PauseProcessor(BaseProcessor):
             raise ProcessingError("请先创建草稿")
             
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        pause_duration = duration_manager.validate_duration_bounds(pause_duration, "音频停顿")
+        pause_duration = self.duration_manager.validate_duration_bounds(pause_duration, "音频停顿")
         
         # 验证开始时间
         effective_duration = self.context.get_effective_video_duration()
@@ -70,9 +76,7 @@ class PauseProcessor(BaseProcessor):
             raise ProcessingError("请先创建草稿")
             
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        pause_duration = duration_manager.validate_duration_bounds(pause_duration, "视频停顿")
+        pause_duration = self.duration_manager.validate_duration_bounds(pause_duration, "视频停顿")
         
         # 验证开始时间
         effective_duration = self.context.get_effective_video_duration()
@@ -133,47 +137,59 @@ class PauseProcessor(BaseProcessor):
             min_pause_duration: 最小停顿时长(秒)
             
         Returns:
-            停顿点列表，每个元素包含start_time, duration
+            停顿点列表，每个元素包含start_time, duration(秒)及对应的整数微秒值start_us, duration_us
         """
         if not asr_result or len(asr_result) < 2:
             self._log("warning", "ASR结果不足，无法检测自然停顿")
             return []
             
-        pauses = []
-        
-        # 按开始时间排序
-        sorted_segments = sorted(asr_result, key=lambda x: float(x.get('start_time', 0)))
-        
-        for i in range(len(sorted_segments) - 1):
-            current_segment = sorted_segments[i]
-            next_segment = sorted_segments[i + 1]
-            
-            try:
-                current_end = float(current_segment.get('end_time', 0))
-                next_start = float(next_segment.get('start_time', 0))
-                
-                # 计算间隙时长
-                gap_duration = next_start - current_end
-                
-                if gap_duration >= min_gap:
-                    # 计算建议的停顿时长（不超过原间隙）
-                    pause_duration = max(min_pause_duration, min(gap_duration * 0.8, 2.0))
-                    
-                    # 验证时长边界
-                    from ..managers.duration_manager import DurationManager
-                    duration_manager = DurationManager(self.context, self.logger)
-                    pause_duration = duration_manager.validate_duration_bounds(pause_duration, "自然停顿")
-                    
-                    pauses.append({
-                        "start_time": round(current_end, 2),
-                        "duration": round(pause_duration, 2),
-                        "gap_duration": round(gap_duration, 2),
-                        "natural": True
-                    })
-                    
-            except (ValueError, KeyError) as e:
-                self._log("warning", f"处理停顿检测时出错: {e}, 段落: {current_segment}, {next_segment}")
-                continue
+        # 一次性解析所有段的起止时间，无法解析的值记为NaN
+        count = len(asr_result)
+        starts = np.fromiter((_to_float(s.get('start_time', 0)) for s in asr_result), dtype=np.float64, count=count)
+        ends = np.fromiter((_to_float(s.get('end_time', 0)) for s in asr_result), dtype=np.float64, count=count)
+        
+        # ASR结果通常已按时间排序，只在出现乱序或无效时间时才做稳定排序
+        order = None
+        if np.isnan(starts).any() or (starts[1:] < starts[:-1]).any():
+            order = np.argsort(starts, kind='stable')
+            starts = starts[order]
+            ends = ends[order]
+        
+        # 相邻段之间的间隙
+        current_ends = ends[:-1]
+        gaps = starts[1:] - current_ends
+        
+        invalid = np.isnan(gaps)
+        if invalid.any():
+            for i in np.flatnonzero(invalid):
+                current, following = (order[i], order[i + 1]) if order is not None else (i, i + 1)
+                self._log("warning", f"处理停顿检测时出错: 无效的时间值, 段落: {asr_result[current]}, {asr_result[following]}")
+        
+        mask = gaps >= min_gap
+        current_ends = current_ends[mask]
+        gaps = gaps[mask]
+        
+        # 建议的停顿时长（不超过原间隙的80%，且不超过2秒），再统一验证时长边界
+        pause_durations = np.maximum(min_pause_duration, np.minimum(gaps * 0.8, 2.0))
+        pause_durations = self.duration_manager.validate_duration_bounds_array(pause_durations, "自然停顿")
+        
+        # 结果以整数微秒存储，秒值仅作换算，不再逐项取整
+        start_us = np.rint(current_ends * 1000000).astype(np.int64)
+        duration_us = np.rint(pause_durations * 1000000).astype(np.int64)
+        gap_us = np.rint(gaps * 1000000).astype(np.int64)
+        
+        pauses = [
+            {
+                "start_us": start,
+                "duration_us": duration,
+                "gap_us": gap,
+                "start_time": start / 1000000,
+                "duration": duration / 1000000,
+                "gap_duration": gap / 1000000,
+                "natural": True
+            }
+            for start, duration, gap in zip(start_us.tolist(), duration_us.tolist(), gap_us.tolist())
+        ]
         
         self._log("info", f"检测到 {len(pauses)} 个自然停顿点")
         
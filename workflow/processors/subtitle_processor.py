@@ -5,11 +5,197 @@
 """
 
 import os
+import re
+import heapq
+from itertools import chain, islice
+from functools import lru_cache, partial
+import numpy as np
 import pyJianYingDraft as draft
-from pyJianYingDraft import tim, trange
-from typing import Optional, List, Dict, Any, Tuple
+from pyJianYingDraft.exceptions import SegmentOverlap
+from typing import Optional, List, Dict, Any, Tuple, Iterable
 from ..core.base import BaseProcessor, WorkflowContext
 from ..core.exceptions import ProcessingError
+from ..utils.numeric import sec_to_us, trange_us
+
+# ASR结果按块解析时间，流式输入无需整体读入内存
+_ASR_CHUNK_SIZE = 256
+
+# 标题拆分使用的标点/空白分隔符
+_TITLE_SPLIT_RE = re.compile(r'[，。！？、;；\s]+')
+
+# SRT字幕块：序号、起止时间戳（时、分、秒、毫秒，兼容","和"."）、到空行为止的文本
+_SRT_RE = re.compile(
+    rb"(\d+)[ \t]*\r?\n"
+    rb"(\d+):(\d{2}):(\d{2})[,.](\d{3})[ \t]*-->[ \t]*(\d+):(\d{2}):(\d{2})[,.](\d{3})[^\r\n]*"
+    # 文本可以为空：时间行后紧跟空行或文件结尾时不匹配文本，避免吞掉下一条字幕
+    rb"(?:\r?\n(?![ \t]*(?:\r?\n|\Z))(.*?))?(?=\r?\n[ \t]*(?:\r?\n|\Z)|\s*\Z)",
+    re.DOTALL
+)
+
+# 可选依赖：安装了pyahocorasick时使用Aho–Corasick自动机做多关键词匹配
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def _build_keyword_matcher(keywords: Optional[List[str]]):
+    """构建多关键词匹配函数
+    
+    返回的函数接收文本，返回所有 (关键词, 起始索引, 结束索引) 匹配，按关键词顺序、起始位置排列，
+    同一关键词的匹配互不重叠；没有有效关键词时返回None
+    """
+    keywords = list(dict.fromkeys(k for k in keywords or () if k and k.strip()))
+    if not keywords:
+        return None
+        
+    if ahocorasick is not None:
+        # 自动机只构建一次，每条字幕单遍扫描即可得到所有关键词的匹配
+        automaton = ahocorasick.Automaton()
+        for index, keyword in enumerate(keywords):
+            automaton.add_word(keyword, (index, keyword))
+        automaton.make_automaton()
+        
+        def match(text: str) -> List[Tuple[str, int, int]]:
+            found = sorted((index, end - len(keyword) + 1, keyword) for end, (index, keyword) in automaton.iter(text))
+            matches = []
+            last_index, last_end = -1, 0
+            for index, start, keyword in found:
+                # 与同一关键词的上一个匹配重叠时跳过，和逐个查找的结果保持一致
+                if index == last_index and start < last_end:
+                    continue
+                last_index, last_end = index, start + len(keyword)
+                matches.append((keyword, start, last_end))
+            return matches
+        return match
+        
+    def match(text: str) -> List[Tuple[str, int, int]]:
+        matches = []
+        for keyword in keywords:
+            pos = text.find(keyword)
+            while pos != -1:
+                end = pos + len(keyword)
+                matches.append((keyword, pos, end))
+                # 从匹配结束处继续查找，跳过已匹配的区域
+                pos = text.find(keyword, end)
+        return matches
+    return match
+
+# 字幕背景使用的样式对象只在导出时读取，按参数缓存后在多次调用间共享，调用方不应修改
+@lru_cache(maxsize=64)
+def _text_background(color: str, alpha: float, height: float, width: float, horizontal_offset: float,
+                     vertical_offset: float, round_radius: float, style: int) -> draft.TextBackground:
+    """按背景参数缓存的文本背景"""
+    return draft.TextBackground(
+        color=color,
+        alpha=alpha,
+        height=height,
+        width=width,
+        horizontal_offset=horizontal_offset,
+        vertical_offset=vertical_offset,
+        round_radius=round_radius,
+        style=style
+    )
+
+@lru_cache(maxsize=None)
+def _default_text_shadow() -> draft.TextShadow:
+    """字幕背景使用的默认阴影"""
+    return draft.TextShadow(
+        alpha=0.8,
+        color=(0.0, 0.0, 0.0),
+        diffuse=20.0,
+        distance=10.0,
+        angle=-45.0
+    )
+
+@lru_cache(maxsize=None)
+def _white_bold_style(size: float) -> draft.TextStyle:
+    """居中对齐的白色粗体样式"""
+    return draft.TextStyle(
+        size=size,
+        color=(1.0, 1.0, 1.0),  # 白色文字
+        bold=True,
+        align=0,  # 居中对齐
+        line_spacing=0
+    )
+
+def _asr_text(segment: Any) -> Any:
+    """取出ASR段去除首尾空白的文本，段格式错误时返回对应的异常，由调用方按原顺序记录警告"""
+    try:
+        return segment.get('text', '').strip()
+    except Exception as e:
+        return e
+
+def _parse_asr_times(segment: Any) -> Tuple[float, float]:
+    """解析ASR段的起止时间（秒），缺少结束时间时默认持续1秒，无法解析时返回NaN"""
+    try:
+        start = float(segment.get('start_time', 0))
+        end = float(segment.get('end_time', start + 1))
+    except (AttributeError, TypeError, ValueError):
+        return float('nan'), float('nan')
+    return start, end
+
+def _asr_times_us(asr_result: List[Dict[str, Any]], effective_us: int,
+                  max_allowed_duration: float) -> Tuple[List[int], List[int], List[bool], List[bool]]:
+    """批量计算ASR段的起始时间和持续时长（整数微秒）
+    
+    起止时间不超过有效时长（effective_us大于0时），结束时间不晚于开始时间的段修正为1秒。
+    
+    Returns:
+        (起始时间列表, 持续时长列表, 时间是否有效列表, 时长是否在最大允许时长内列表)
+    """
+    times = np.array([_parse_asr_times(segment) for segment in asr_result], dtype=np.float64).reshape(-1, 2)
+    valid = np.isfinite(times).all(axis=1)
+    times[~valid] = 0.0
+    times_us = np.rint(times * 1000000).astype(np.int64)
+    starts_us = times_us[:, 0]
+    ends_us = times_us[:, 1]
+    
+    # 确保开始时间和结束时间都在有效范围内
+    if effective_us > 0:
+        np.minimum(starts_us, effective_us, out=starts_us)
+        np.minimum(ends_us, effective_us, out=ends_us)
+    
+    # 确保结束时间大于开始时间，最小1秒时长
+    too_short = ends_us <= starts_us
+    ends_us[too_short] = starts_us[too_short] + 1000000
+    
+    durations_us = ends_us - starts_us
+    
+    # 与 validate_duration_bounds 相同的比较；没有时长参考时全部标记为需要逐段验证
+    if max_allowed_duration > 0:
+        in_bounds = durations_us / 1000000 <= max_allowed_duration
+    else:
+        in_bounds = np.zeros(len(durations_us), dtype=bool)
+    
+    return starts_us.tolist(), durations_us.tolist(), valid.tolist(), in_bounds.tolist()
+
+def _srt_seconds(hours: bytes, minutes: bytes, seconds: bytes, millis: bytes) -> float:
+    """SRT时间戳各字段换算为秒"""
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+def load_srt(path: str) -> List[Dict[str, Any]]:
+    """读取SRT字幕文件，转换为ASR结果格式
+    
+    Args:
+        path: SRT文件路径（UTF-8编码，可带BOM）
+        
+    Returns:
+        字幕段列表，每个元素包含text, start_time, end_time(秒)，可直接传给add_subtitle_from_asr
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+        
+    segments = []
+    for m in _SRT_RE.finditer(data):
+        groups = m.groups()
+        # 只解码字幕文本；多行文本统一为\n换行
+        text = (groups[9] or b'').decode('utf-8', errors='replace').replace('\r\n', '\n').strip()
+        segments.append({
+            'text': text,
+            'start_time': _srt_seconds(*groups[1:5]),
+            'end_time': _srt_seconds(*groups[5:9])
+        })
+    return segments
 
 class SubtitleProcessor(BaseProcessor):
     """字幕处理器"""
@@ -18,79 +204,129 @@ class SubtitleProcessor(BaseProcessor):
         """占位方法"""
         pass
         
-    def add_subtitle_from_asr(self, asr_result: List[Dict[str, Any]], track_name: str = "内容字幕轨道"):
+    def add_subtitle_from_asr(self, asr_result: Iterable[Dict[str, Any]], track_name: str = "内容字幕轨道",
+                              batch_window_seconds: Optional[float] = 60.0):
         """从ASR结果添加字幕
         
         Args:
-            asr_result: ASR识别结果列表，每个元素包含text, start_time, end_time
+            asr_result: ASR识别结果，可以是列表或逐段产出结果的迭代器，每个元素包含text, start_time, end_time
             track_name: 字幕轨道名称
+            batch_window_seconds: 按开始时间每隔多少秒批量写入一次轨道，None或不大于0时全部处理完再一次写入
         """
         if not self.context.script:
             raise ProcessingError("请先创建草稿")
             
-        if not asr_result:
+        # 先取出第一段判断是否为空，再与剩余部分拼接，迭代器输入也只遍历一次
+        rows = iter(asr_result or ())
+        first = next(rows, rows)
+        if first is rows:
             self._log("warning", "ASR结果为空，无法生成字幕")
             return
+        rows = chain((first,), rows)
             
         # 确保字幕轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         # 清除现有字幕以避免重叠
-        track_manager.clear_track_segments(track_name)
+        self.track_manager.clear_track_segments(track_name)
         
-        # 获取有效视频时长用于验证
-        effective_duration = self.context.get_effective_video_duration()
+        # 有效视频时长和最大允许时长只计算一次，逐段的边界处理使用整数微秒
+        effective_us = self.context.get_effective_video_duration_us()
+        max_allowed_duration = self.duration_manager.get_max_allowed_duration()
+        
+        # 循环中反复使用的属性绑定为局部变量
+        TextSegment = draft.TextSegment
+        validate_duration_bounds = self.duration_manager.validate_duration_bounds
+        # 调试日志是否输出只判断一次，关闭时跳过逐段的格式化
+        debug_enabled = self._debug_enabled()
         
+        # 按时间窗口分批写入轨道，流式输入时字幕段随到随写，不必等待全部结果
+        window_us = sec_to_us(batch_window_seconds) if batch_window_seconds and batch_window_seconds > 0 else 0
+        window_end_us = None
+        
+        text_segments = []
+        built_count = 0
         subtitle_count = 0
-        for segment in asr_result:
-            try:
-                text = segment.get('text', '').strip()
-                if not text:
-                    continue
-                    
-                start_time = float(segment.get('start_time', 0))
-                end_time = float(segment.get('end_time', start_time + 1))
-                
-                # 验证时间边界
-                from ..managers.duration_manager import DurationManager
-                duration_manager = DurationManager(self.context, self.logger)
-                
-                # 确保开始时间和结束时间都在有效范围内
-                if effective_duration > 0:
-                    start_time = min(start_time, effective_duration)
-                    end_time = min(end_time, effective_duration)
+        while True:
+            chunk = list(islice(rows, _ASR_CHUNK_SIZE))
+            if not chunk:
+                break
                 
-                # 确保结束时间大于开始时间
-                if end_time <= start_time:
-                    end_time = start_time + 1.00  # 最小1秒时长
+            # 先取出文本并跳过空白段，剩余段的起止时间统一解析为数组，
+            # 再向量化地完成截取、最小时长修正和最大时长判断，循环中不再访问字典
+            texts = [_asr_text(segment) for segment in chunk]
+            kept = [i for i, text in enumerate(texts) if text]
+            segments = [chunk[i] for i in kept]
+            texts = [texts[i] for i in kept]
+            starts_us, durations_us, valid, in_bounds = _asr_times_us(segments, effective_us, max_allowed_duration)
+            
+            for segment, text, start_us, duration_us, is_valid, is_in_bounds in zip(
+                    segments, texts, starts_us, durations_us, valid, in_bounds):
+                try:
+                    if isinstance(text, Exception):
+                        raise text
+                    if not is_valid:
+                        raise ValueError("无效的时间值")
+                        
+                    # 已在允许范围内的时长只需保留两位小数，超出或无法验证的才交给 validate_duration_bounds
+                    if is_in_bounds:
+                        duration = round(duration_us / 1000000, 2)
+                    else:
+                        duration = validate_duration_bounds(
+                            duration_us / 1000000, f"字幕段({text[:10]}...)", max_allowed_duration
+                        )
+                    duration_us = sec_to_us(duration)
                     
-                duration = end_time - start_time
-                duration = duration_manager.validate_duration_bounds(duration, f"字幕段({text[:10]}...)")
-                
-                # 重新计算结束时间
-                end_time = start_time + duration
-                
-                # 创建字幕片段
-                text_segment = draft.TextSegment(
-                    text=text,
-                    time_range=trange(tim(f"{start_time:.6f}s"), tim(f"{end_time:.6f}s"))
-                )
-                
-                # 添加到字幕轨道
-                self.context.script.add_segment(text_segment, track_name=track_name)
-                subtitle_count += 1
-                
-                self._log("debug", f"字幕段 {subtitle_count}: '{text[:20]}...' ({start_time:.2f}s - {end_time:.2f}s)")
-                
-            except Exception as e:
-                self._log("warning", f"处理字幕段时出错: {e}, 数据: {segment}")
-                continue
+                    # 创建字幕片段
+                    text_segment = TextSegment(
+                        text,
+                        trange_us(start_us, duration_us)
+                    )
+                    
+                    # 超出当前时间窗口时先写入已积累的字幕段
+                    if window_us:
+                        if window_end_us is not None and start_us >= window_end_us:
+                            subtitle_count += self._add_subtitle_batch(text_segments, track_name)
+                            text_segments = []
+                            window_end_us = None
+                        if window_end_us is None:
+                            window_end_us = start_us + window_us
+                    
+                    text_segments.append((text_segment, segment))
+                    built_count += 1
+                    if debug_enabled:
+                        self._log("debug", "字幕段 %d: '%s...' (%.2fs - %.2fs)", built_count, text[:20],
+                                  start_us / 1000000, (start_us + duration_us) / 1000000)
+                    
+                except Exception as e:
+                    self._log("warning", f"处理字幕段时出错: {e}, 数据: {segment}")
+                    continue
+        
+        subtitle_count += self._add_subtitle_batch(text_segments, track_name)
         
         self._log("info", f"字幕已添加到轨道 '{track_name}': {subtitle_count} 个字幕段")
         return subtitle_count
         
+    def _add_subtitle_batch(self, text_segments: List[Tuple[Any, Any]], track_name: str) -> int:
+        """将一批 (字幕片段, 原始ASR段) 写入轨道，返回成功添加的数量
+        
+        整批一次性添加；存在重叠时退回逐个添加，跳过重叠的字幕段
+        """
+        if not text_segments:
+            return 0
+        try:
+            self.track_manager.add_segments([text_segment for text_segment, _ in text_segments], track_name)
+            return len(text_segments)
+        except SegmentOverlap:
+            added = 0
+            for text_segment, segment in text_segments:
+                try:
+                    self.track_manager.add_segment(text_segment, track_name)
+                    added += 1
+                except SegmentOverlap as e:
+                    self._log("warning", f"处理字幕段时出错: {e}, 数据: {segment}")
+            return added
+        
     def add_title_subtitle(self, title: str, start_time: float = 0.0, duration: float = 3.0, 
                           track_name: str = "标题字幕轨道"):
         """添加标题字幕
@@ -109,13 +345,7 @@ class SubtitleProcessor(BaseProcessor):
             return
             
         # 确保标题字幕轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
-        
-        # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         # 验证开始时间
         effective_duration = self.context.get_effective_video_duration()
@@ -126,14 +356,14 @@ class SubtitleProcessor(BaseProcessor):
         # 验证持续时长
         available_duration = effective_duration - start_time if effective_duration > 0 else duration
         duration = min(duration, available_duration)
-        duration = duration_manager.validate_duration_bounds(duration, "标题字幕")
+        duration = self.duration_manager.validate_duration_bounds(duration, "标题字幕")
         
         end_time = start_time + duration
         
         # 创建标题字幕片段
         title_segment = draft.TextSegment(
-            text=title,
-            time_range=trange(tim(f"{start_time:.6f}s"), tim(f"{end_time:.6f}s"))
+            title,
+            trange_us(sec_to_us(start_time), sec_to_us(duration))
         )
         
         # 添加到标题字幕轨道
@@ -160,9 +390,7 @@ class SubtitleProcessor(BaseProcessor):
             return
             
         # 确保字幕轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         # 验证时间参数
         if end_time <= start_time:
@@ -170,17 +398,14 @@ class SubtitleProcessor(BaseProcessor):
             self._log("warning", f"字幕结束时间无效，调整为: {end_time:.2f}s")
         
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        
         duration = end_time - start_time
-        duration = duration_manager.validate_duration_bounds(duration, f"自定义字幕({text[:10]}...)")
+        duration = self.duration_manager.validate_duration_bounds(duration, f"自定义字幕({text[:10]}...)")
         end_time = start_time + duration
         
         # 创建字幕片段
         text_segment = draft.TextSegment(
-            text=text,
-            time_range=trange(tim(f"{start_time:.6f}s"), tim(f"{end_time:.6f}s"))
+            text,
+            trange_us(sec_to_us(start_time), sec_to_us(duration))
         )
         
         # 添加到字幕轨道
@@ -189,61 +414,72 @@ class SubtitleProcessor(BaseProcessor):
         self._log("info", f"自定义字幕已添加: '{text}' ({start_time:.2f}s - {end_time:.2f}s)")
         return text_segment
         
-    def process_subtitle_timing_optimization(self, min_duration: float = 1.0, max_duration: float = 8.0):
+    def process_subtitle_timing_optimization(self, min_duration: float = 1.0, max_duration: float = 8.0,
+                                             track_name: str = "内容字幕轨道"):
         """优化字幕时间，确保合适的显示时长
         
+        每次调用只处理 track_name 指定的一条字幕轨道（默认内容字幕轨道），不再遍历所有文本轨道：
+        标题、字幕背景等整段显示的文本轨道不受影响，其他字幕轨道（如英文字幕）需要优化时请按轨道名分别调用。
+        过短的字幕最多延长到下一段字幕开始，不会与其重叠。
+        
         Args:
             min_duration: 最小字幕时长(秒)
             max_duration: 最大字幕时长(秒)
+            track_name: 需要优化的字幕轨道名称
+            
+        Returns:
+            实际调整了时长的字幕段数，轨道不存在或为空时为0
         """
         if not self.context.script:
             raise ProcessingError("请先创建草稿")
             
-        # 找到所有字幕轨道
-        subtitle_tracks = []
-        for track_name, track in self.context.script.tracks.items():
-            if hasattr(track, 'track_type') and track.track_type == draft.TrackType.text:
-                subtitle_tracks.append((track_name, track))
-        
-        if not subtitle_tracks:
-            self._log("warning", "没有找到字幕轨道")
-            return
-        
-        optimized_count = 0
-        for track_name, track in subtitle_tracks:
-            if hasattr(track, 'segments') and track.segments:
-                for segment in track.segments:
-                    if hasattr(segment, 'time_range'):
-                        # 获取当前时长
-                        start_micro = segment.time_range.start
-                        end_micro = segment.time_range.end
-                        
-                        current_duration = (end_micro - start_micro) / 1000000
-                        
-                        # 检查是否需要优化
-                        needs_optimization = False
-                        new_duration = current_duration
-                        
-                        if current_duration < min_duration:
-                            new_duration = min_duration
-                            needs_optimization = True
-                        elif current_duration > max_duration:
-                            new_duration = max_duration
-                            needs_optimization = True
-                        
-                        if needs_optimization:
-                            # 验证新时长
-                            from ..managers.duration_manager import DurationManager
-                            duration_manager = DurationManager(self.context, self.logger)
-                            new_duration = duration_manager.validate_duration_bounds(new_duration, f"优化字幕({track_name})")
-                            
-                            # 更新时间范围
-                            new_end_micro = start_micro + int(new_duration * 1000000)
-                            segment.time_range = trange(start_micro, new_end_micro)
-                            
-                            optimized_count += 1
-                            self._log("debug", f"优化字幕时长: {current_duration:.2f}s -> {new_duration:.2f}s")
-        
+        track = self.context.script.tracks.get(track_name)
+        if track is None or track.track_type != draft.TrackType.text:
+            self._log("warning", f"没有找到字幕轨道: {track_name}")
+            return 0
+            
+        segments = track.segments
+        if not segments:
+            self._log("info", "字幕时间优化完成，共优化 0 个字幕段")
+            return 0
+        
+        min_us = sec_to_us(min_duration)
+        max_us = sec_to_us(max_duration)
+        
+        # 单次遍历取出所有段的起始时间和时长（微秒），向量化截取到 [min, max]
+        ranges = np.array([(seg.target_timerange.start, seg.target_timerange.duration) for seg in segments],
+                          dtype=np.int64).reshape(-1, 2)
+        starts = ranges[:, 0]
+        durations = ranges[:, 1]
+        new_durations = np.clip(durations, min_us, max_us)
+        
+        # 每段到下一段开始的间隔（按开始时间排序），最后一段不受限制
+        order = np.argsort(starts, kind='stable')
+        gaps = np.full(len(segments), np.iinfo(np.int64).max, dtype=np.int64)
+        gaps[order[:-1]] = starts[order[1:]] - starts[order[:-1]]
+        # 延长的段不超过下一段的开始；原本就更长的段保持原时长，不因此被缩短
+        extend_limits = np.maximum(durations, gaps)
+        np.minimum(new_durations, extend_limits, out=new_durations)
+        
+        changed = np.flatnonzero(new_durations != durations)
+        if changed.size:
+            # 与 validate_duration_bounds 规则一致：不超过最大允许时长，保留两位小数
+            new_seconds = self.duration_manager.validate_duration_bounds_array(
+                new_durations[changed] / 1000000, f"优化字幕({track_name})"
+            )
+            new_durations_us = np.rint(np.round(new_seconds, 2) * 1000000).astype(np.int64)
+            # 保留两位小数时可能向上取整，再按间隔截取一次
+            np.minimum(new_durations_us, extend_limits[changed], out=new_durations_us)
+            
+            # 只回写时长确实改变的段（截取到最大允许时长后可能与原时长相同）
+            Timerange = draft.Timerange
+            rewrite = new_durations_us != durations[changed]
+            changed = changed[rewrite]
+            for i, start_us, duration_us in zip(changed.tolist(), starts[changed].tolist(),
+                                                new_durations_us[rewrite].tolist()):
+                segments[i].target_timerange = Timerange(start_us, duration_us)
+        
+        optimized_count = int(changed.size)
         self._log("info", f"字幕时间优化完成，共优化 {optimized_count} 个字幕段")
         return optimized_count
     
@@ -281,12 +517,10 @@ class SubtitleProcessor(BaseProcessor):
             return
         
         # 确保字幕轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         # 清除现有字幕以避免重叠
-        track_manager.clear_track_segments(track_name)
+        self.track_manager.clear_track_segments(track_name)
         
         # 设置字体类型
         if font_type is None:
@@ -299,6 +533,21 @@ class SubtitleProcessor(BaseProcessor):
             transform_y = bottom_transform_y
             
         text_segments = []
+        match_keywords = _build_keyword_matcher(keywords)
+        max_allowed_duration = self.duration_manager.get_max_allowed_duration()
+        
+        # 样式和图像调节参数在本次调用中固定不变，只构造一次供所有字幕段共享
+        style = draft.TextStyle(
+            color=base_color,
+            size=base_font_size,
+            auto_wrapping=True,
+            bold=True,
+            align=0,  # 居中对齐
+            max_line_width=0.82
+        )
+        clip_settings = draft.ClipSettings(transform_y=transform_y, scale_x=scale, scale_y=scale)
+        make_segment = partial(draft.TextSegment, font=font_type, style=style, clip_settings=clip_settings)
+        validate_duration_bounds = self.duration_manager.validate_duration_bounds
         
         for caption in caption_data:
             text = caption.get('text', '')
@@ -308,56 +557,33 @@ class SubtitleProcessor(BaseProcessor):
             if not text:
                 continue
             
-            # 过滤出在当前文本中实际存在的关键词
-            current_keywords = []
-            if keywords:
-                for keyword in keywords:
-                    if keyword and keyword.strip() and keyword in text:
-                        current_keywords.append(keyword)
-            
-            # 验证时间边界
-            from ..managers.duration_manager import DurationManager
-            duration_manager = DurationManager(self.context, self.logger)
-            
+            # 验证时间边界：在允许范围内时只需保留两位小数，超出或无法验证时才构造上下文并交给 validate_duration_bounds
             duration = end_time - start_time
-            duration = duration_manager.validate_duration_bounds(duration, f"字幕段({text[:10]}...)")
+            if 0 < max_allowed_duration and duration <= max_allowed_duration:
+                duration = round(duration, 2)
+            else:
+                duration = validate_duration_bounds(duration, f"字幕段({text[:10]}...)", max_allowed_duration)
             end_time = start_time + duration
             
-            # 创建文本片段
-            text_segment = draft.TextSegment(
-                text,
-                trange(tim(f"{start_time:.2f}s"), tim(f"{duration:.2f}s")),
-                font=font_type,
-                style=draft.TextStyle(
-                    color=base_color,
-                    size=base_font_size,
-                    auto_wrapping=True,
-                    bold=True,
-                    align=0,  # 居中对齐
-                    max_line_width=0.82
-                ),
-                clip_settings=draft.ClipSettings(transform_y=transform_y, scale_x=scale, scale_y=scale)
-            )
+            # 创建文本片段，只有文本和时间范围随字幕变化
+            text_segment = make_segment(text, trange_us(sec_to_us(start_time), sec_to_us(duration)))
             
             # 添加关键词高亮
-            if current_keywords:
-                for keyword in current_keywords:
-                    start_idx = 0
-                    while True:
-                        pos = text.find(keyword, start_idx)
-                        if pos == -1:
-                            break
-                        end_idx = pos + len(keyword)
-                        try:
-                            text_segment.add_highlight(pos, end_idx, color=highlight_color, size=highlight_size, bold=True)
-                        except Exception as e:
-                            self._log("debug", f"添加高亮失败: {e}")
-                        start_idx = pos + 1
+            matches = match_keywords(text) if match_keywords else []
+            if matches:
+                for keyword, start_idx, end_idx in matches:
+                    try:
+                        text_segment.add_highlight(start_idx, end_idx, color=highlight_color, size=highlight_size, bold=True)
+                    except Exception as e:
+                        self._log("debug", "添加高亮失败: %s", e)
                 
+                current_keywords = list(dict.fromkeys(keyword for keyword, _, _ in matches))
                 self._log("info", f"字幕 '{text}' 中高亮关键词: {current_keywords}")
             
             text_segments.append(text_segment)
-            self.context.script.add_segment(text_segment, track_name=track_name)
+        
+        # 所有字幕段一次性加入轨道
+        self.track_manager.add_segments(text_segments, track_name)
         
         self._log("info", f"带关键词高亮的字幕已添加到轨道 '{track_name}': {len(text_segments)} 个字幕段")
         return text_segments
@@ -406,16 +632,21 @@ class SubtitleProcessor(BaseProcessor):
             total_duration = round(effective_duration, 2)
             self._log("info", f"字幕背景使用有效视频时长: {total_duration:.2f}s")
         else:
-            # 回退方案：使用字幕时长
-            caption_start = min(caption.get('start', 0) for caption in caption_data)
-            caption_end = max(caption.get('end', 0) for caption in caption_data)
+            # 回退方案：使用字幕时长，一次遍历同时求最早开始和最晚结束
+            caption_start = float('inf')
+            caption_end = float('-inf')
+            for caption in caption_data:
+                start = caption.get('start', 0)
+                end = caption.get('end', 0)
+                if start < caption_start:
+                    caption_start = start
+                if end > caption_end:
+                    caption_end = end
             total_duration = round(caption_end - caption_start, 2)
             self._log("info", f"字幕背景使用字幕时长: {total_duration:.2f}s")
         
         # 验证背景时长不超过视频总时长
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        total_duration = duration_manager.validate_duration_bounds(total_duration, "字幕背景")
+        total_duration = self.duration_manager.validate_duration_bounds(total_duration, "字幕背景")
         
         # 根据位置设置不同的垂直位置
         if position == "top":
@@ -426,48 +657,32 @@ class SubtitleProcessor(BaseProcessor):
         # 创建背景文本片段（使用占位符确保背景显示）
         placeholder_text = " " * 50  # 使用固定长度的占位符
         
-        # 创建文本背景
-        text_background = draft.TextBackground(
-            color=background_style["color"],
-            alpha=background_style["alpha"],
-            height=background_style["height"],
-            width=background_style["width"],
-            horizontal_offset=background_style["horizontal_offset"],
-            vertical_offset=background_style["vertical_offset"],
-            round_radius=background_style.get("round_radius", 0.0),
-            style=background_style.get("style", 1)
-        )
-        
-        # 创建文本样式
-        text_style = draft.TextStyle(
-            size=15.0,
-            color=(1.0, 1.0, 1.0),  # 白色文字
-            bold=True,
-            align=0,  # 居中对齐
-            line_spacing=0
+        # 文本背景和样式按参数复用，批量生成时不重复创建
+        text_background = _text_background(
+            background_style["color"],
+            background_style["alpha"],
+            background_style["height"],
+            background_style["width"],
+            background_style["horizontal_offset"],
+            background_style["vertical_offset"],
+            background_style.get("round_radius", 0.0),
+            background_style.get("style", 1)
         )
+        text_style = _white_bold_style(15.0)
         
         # 创建文本片段
         text_segment = draft.TextSegment(
             placeholder_text,
-            trange(tim(f"{start_time:.6f}s"), tim(f"{total_duration:.6f}s")),
+            trange_us(sec_to_us(start_time), sec_to_us(total_duration)),
             font=draft.FontType.文轩体,
             style=text_style,
             clip_settings=draft.ClipSettings(transform_y=transform_y),
             background=text_background,
-            shadow=draft.TextShadow(
-                alpha=0.8,
-                color=(0.0, 0.0, 0.0),
-                diffuse=20.0,
-                distance=10.0,
-                angle=-45.0
-            )
+            shadow=_default_text_shadow()
         )
         
         # 确保目标轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         # 添加到轨道
         self.context.script.add_segment(text_segment, track_name=track_name)
@@ -510,9 +725,7 @@ class SubtitleProcessor(BaseProcessor):
             duration = round(max(1.0, effective_duration) if effective_duration > 0 else 5.0, 2)
         
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        duration = duration_manager.validate_duration_bounds(duration, "三行标题")
+        duration = self.duration_manager.validate_duration_bounds(duration, "三行标题")
         
         style = draft.TextStyle(
             size=15.0,
@@ -526,7 +739,7 @@ class SubtitleProcessor(BaseProcessor):
         
         seg = draft.TextSegment(
             text,
-            trange(tim(f"{start:.6f}s"), tim(f"{duration:.6f}s")),
+            trange_us(sec_to_us(start), sec_to_us(duration)),
             font=draft.FontType.俪金黑,
             style=style,
             clip_settings=draft.ClipSettings(transform_y=transform_y)
@@ -541,9 +754,7 @@ class SubtitleProcessor(BaseProcessor):
             seg.add_highlight(start_idx, end_idx, color=highlight_color, bold=True)
         
         # 确保轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.text, track_name)
+        self.track_manager.ensure_track_exists(draft.TrackType.text, track_name)
         
         self.context.script.add_segment(seg, track_name=track_name)
         self._log("info", f"三行标题已添加到 {track_name}: {lines}")
@@ -560,9 +771,7 @@ class SubtitleProcessor(BaseProcessor):
             return [title, "", ""]
         
         # 按标点符号切分，再均匀分配到三行
-        import re
-        tokens = re.split(r'[，。！？、;；\s]+', title)
-        tokens = [t for t in tokens if t]
+        tokens = [t for t in _TITLE_SPLIT_RE.split(title) if t]
         
         if len(tokens) <= 3:
             result = tokens[:]
@@ -570,15 +779,14 @@ class SubtitleProcessor(BaseProcessor):
                 result.append("")
             return result[:3]
         
-        # 均匀分配
-        target = [[], [], []]
-        lengths = [0, 0, 0]
+        # 均匀分配：用 (长度, 行号) 小顶堆取当前最短的行，长度相同时取靠前的行
+        heap = [(0, i, []) for i in range(3)]
         for token in tokens:
-            i = lengths.index(min(lengths))
-            target[i].append(token)
-            lengths[i] += len(token)
+            length, i, buf = heapq.heappop(heap)
+            buf.append(token)
+            heapq.heappush(heap, (length + len(token), i, buf))
         
-        return [''.join(x) for x in target]
+        return [''.join(buf) for _, _, buf in sorted(heap, key=lambda item: item[1])]
         
     def get_subtitle_statistics(self) -> Dict[str, Any]:
         """获取字幕统计信息
@@ -597,33 +805,31 @@ class SubtitleProcessor(BaseProcessor):
         }
         
         # 统计所有字幕轨道
-        for track_name, track in self.context.script.tracks.items():
-            if hasattr(track, 'track_type') and track.track_type == draft.TrackType.text:
-                stats["total_tracks"] += 1
-                
-                track_stats = {
-                    "segments": 0,
-                    "duration": 0.0,
-                    "avg_duration": 0.0
-                }
+        for track in self.context.script.get_tracks_by_type(draft.TrackType.text):
+            stats["total_tracks"] += 1
+            
+            track_stats = {
+                "segments": 0,
+                "duration": 0.0,
+                "avg_duration": 0.0
+            }
+            
+            segments = track.segments
+            if segments:
+                # 单次遍历累计整数微秒时长，最后统一换算为秒
+                count = len(segments)
+                total_us = 0
+                for segment in segments:
+                    total_us += segment.target_timerange.duration
                 
-                if hasattr(track, 'segments') and track.segments:
-                    track_stats["segments"] = len(track.segments)
-                    stats["total_segments"] += track_stats["segments"]
-                    
-                    # 计算轨道总时长
-                    for segment in track.segments:
-                        if hasattr(segment, 'time_range'):
-                            segment_duration = (segment.time_range.end - segment.time_range.start) / 1000000
-                            track_stats["duration"] += segment_duration
-                    
-                    # 计算平均时长
-                    if track_stats["segments"] > 0:
-                        track_stats["avg_duration"] = track_stats["duration"] / track_stats["segments"]
-                    
-                    stats["total_duration"] += track_stats["duration"]
+                track_stats["segments"] = count
+                track_stats["duration"] = total_us / 1000000
+                track_stats["avg_duration"] = total_us / count / 1000000
                 
-                stats["tracks"][track_name] = track_stats
+                stats["total_segments"] += count
+                stats["total_duration"] += track_stats["duration"]
+            
+            stats["tracks"][track.name] = track_stats
         
         # 计算整体平均时长
         if stats["total_segments"] > 0:
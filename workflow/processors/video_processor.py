@@ -6,10 +6,11 @@
 
 import os
 import pyJianYingDraft as draft
-from pyJianYingDraft import tim, trange
 from typing import Optional, List, Dict, Any
 from ..core.base import BaseProcessor, WorkflowContext
 from ..core.exceptions import ProcessingError
+from ..managers.material_manager import load_material
+from ..utils.numeric import loop_offsets, sec_to_us, trange_us
 
 class VideoProcessor(BaseProcessor):
     """视频处理器"""
@@ -29,30 +30,32 @@ class VideoProcessor(BaseProcessor):
         if not self.context.script:
             raise ProcessingError("请先创建草稿")
         
-        # 下载视频到本地（依赖MaterialManager）
-        from ..managers.material_manager import MaterialManager
-        material_manager = MaterialManager(self.context, self.logger)
+        # 下载视频到本地
+        video_local_path = self.material_manager.generate_unique_filename("video", ".mp4")
+        local_path, file_size = self.material_manager.fetch_material(video_url, video_local_path)
         
-        video_local_path = material_manager.generate_unique_filename("video", ".mp4")
-        local_path = material_manager.download_material(video_url, video_local_path)
-        
-        # 处理本地路径
+        # 处理本地路径：下载时已得到文件大小，否则仅在输出调试日志时才 stat
         if local_path != video_url:
-            if not os.path.isabs(local_path):
-                local_path = os.path.abspath(local_path)
+            local_path = os.path.abspath(local_path)
             
-            if os.path.exists(local_path):
-                self._log("debug", f"本地视频文件大小: {os.path.getsize(local_path)} bytes")
-            else:
-                raise ProcessingError(f"视频文件不存在: {local_path}")
+            if file_size is None and self._debug_enabled():
+                try:
+                    file_size = os.stat(local_path).st_size
+                except OSError:
+                    raise ProcessingError(f"视频文件不存在: {local_path}")
+            if file_size is not None:
+                self._log("debug", "本地视频文件大小: %d bytes", file_size)
         
-        self._log("debug", f"最终视频路径: {local_path}")
+        self._log("debug", "最终视频路径: %s", local_path)
         
         # 获取视频素材信息
-        video_material = draft.VideoMaterial(local_path)
+        try:
+            video_material = load_material(draft.VideoMaterial, local_path)
+        except FileNotFoundError:
+            raise ProcessingError(f"视频文件不存在: {local_path}")
         actual_video_duration = video_material.duration / 1000000  # 转换为秒
         
-        self._log("debug", f"实际视频时长: {actual_video_duration:.2f} 秒")
+        self._log("debug", "实际视频时长: %.2f 秒", actual_video_duration)
         
         # 确定实际视频时长
         if duration is None:
@@ -66,30 +69,26 @@ class VideoProcessor(BaseProcessor):
                 actual_duration = duration
         
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        actual_duration = duration_manager.validate_duration_bounds(actual_duration, "视频")
+        actual_duration = self.duration_manager.validate_duration_bounds(actual_duration, "视频")
         
-        start_time_microseconds = tim(f"{start_time:.6f}s")
-        duration_microseconds = tim(f"{actual_duration:.6f}s")
-        self.context.video_duration = round(actual_duration, 2)
+        start_time_microseconds = sec_to_us(start_time)
+        duration_microseconds = sec_to_us(actual_duration)
+        self.context.video_duration_us = duration_microseconds
         
         # 创建视频片段
         video_segment = draft.VideoSegment(
             video_material,
-            trange(start_time_microseconds, duration_microseconds)
+            trange_us(start_time_microseconds, duration_microseconds)
         )
         
         # 清除现有视频段以避免重叠
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.clear_track_segments("主视频轨道")
+        self.track_manager.clear_track_segments("主视频轨道")
         
         # 添加到主视频轨道
-        self.context.script.add_segment(video_segment, track_name="主视频轨道")
+        self.track_manager.add_segment(video_segment, "主视频轨道")
         
         # 更新项目时长
-        duration_manager.update_project_duration()
+        self.duration_manager.update_project_duration()
         
         self._log("info", f"主视频已添加: {os.path.basename(local_path)}，时长: {self.context.video_duration:.2f} 秒")
         
@@ -106,85 +105,66 @@ class VideoProcessor(BaseProcessor):
             raise ProcessingError("请先创建草稿")
             
         # 下载数字人视频到本地
-        from ..managers.material_manager import MaterialManager
-        material_manager = MaterialManager(self.context, self.logger)
-        
-        digital_human_local_path = material_manager.generate_unique_filename("digital_human", ".mp4")
-        local_path = material_manager.download_material(digital_human_url, digital_human_local_path)
+        digital_human_local_path = self.material_manager.generate_unique_filename("digital_human", ".mp4")
+        local_path = self.material_manager.download_material(digital_human_url, digital_human_local_path)
         
-        if local_path != digital_human_url and not os.path.exists(local_path):
-            raise ProcessingError(f"数字人视频文件不存在: {local_path}")
+        file_name = os.path.basename(local_path)
         
-        # 获取数字人视频素材信息
-        digital_human_material = draft.VideoMaterial(local_path)
+        # 获取数字人视频素材信息，文件是否存在由加载时的 stat 一并判断
+        try:
+            digital_human_material = load_material(draft.VideoMaterial, local_path)
+        except FileNotFoundError:
+            if local_path != digital_human_url:
+                raise ProcessingError(f"数字人视频文件不存在: {local_path}")
+            raise
         
         # 确定目标时长
         if target_duration is None:
-            effective_duration = self.context.get_effective_video_duration()
-            if effective_duration > 0:
-                target_duration = round(effective_duration, 2)
+            effective_us = self.context.get_effective_video_duration_us()
+            if effective_us > 0:
+                target_duration = round(effective_us / 1000000, 2)
                 self._log("info", f"数字人视频将使用有效视频时长: {target_duration:.2f}s")
-            elif self.context.video_duration > 0:
+            elif self.context.video_duration_us > 0:
                 target_duration = round(self.context.video_duration, 2)
                 self._log("info", f"数字人视频将使用主视频时长: {target_duration:.2f}s")
-            elif self.context.audio_duration > 0:
+            elif self.context.audio_duration_us > 0:
                 target_duration = round(self.context.audio_duration, 2)
                 self._log("info", f"数字人视频将使用音频时长: {target_duration:.2f}s")
             else:
                 raise ProcessingError("无法确定目标时长，请先添加音频或视频，或指定target_duration")
         else:
             # 验证用户指定的目标时长
-            from ..managers.duration_manager import DurationManager
-            duration_manager = DurationManager(self.context, self.logger)
-            target_duration = duration_manager.validate_duration_bounds(target_duration, "数字人视频")
+            target_duration = self.duration_manager.validate_duration_bounds(target_duration, "数字人视频")
         
-        target_duration_microseconds = tim(f"{target_duration:.6f}s")
-        digital_human_duration_microseconds = digital_human_material.duration
-        
-        # 计算是否需要循环播放
-        digital_human_duration_seconds = digital_human_duration_microseconds / 1000000
+        # 时长统一使用整数微秒计算，只在日志中换算为秒
+        target_duration_microseconds = sec_to_us(target_duration)
+        digital_human_duration_microseconds = int(digital_human_material.duration)
         
         # 清除现有数字人视频段
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.clear_track_segments("数字人视频轨道")
+        self.track_manager.clear_track_segments("数字人视频轨道")
         
-        if digital_human_duration_seconds >= target_duration:
+        # 计算是否需要循环播放
+        if digital_human_duration_microseconds >= target_duration_microseconds:
             # 数字人视频够长，直接截取
             digital_human_segment = draft.VideoSegment(
                 digital_human_material,
-                trange(tim("0s"), target_duration_microseconds)
+                trange_us(0, target_duration_microseconds)
             )
-            self.context.script.add_segment(digital_human_segment, track_name="数字人视频轨道")
-            self._log("info", f"数字人视频已添加: {os.path.basename(local_path)}，截取时长: {target_duration:.2f}s")
+            self.track_manager.add_segment(digital_human_segment, "数字人视频轨道")
+            self._log("info", f"数字人视频已添加: {file_name}，截取时长: {target_duration:.2f}s")
         else:
             # 数字人视频太短，需要循环
-            self._log("info", f"数字人视频时长 {digital_human_duration_seconds:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
-            
-            # 计算需要循环的次数
-            loop_count = int(target_duration / digital_human_duration_seconds) + 1
-            current_time = 0
+            self._log("info", f"数字人视频时长 {digital_human_duration_microseconds / 1000000:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
             
-            for i in range(loop_count):
-                # 计算当前循环的持续时间
-                remaining_time = target_duration - current_time
-                if remaining_time <= 0:
-                    break
-                    
-                current_duration = min(digital_human_duration_seconds, remaining_time)
-                
-                # 创建当前循环的视频片段
-                loop_segment = draft.VideoSegment(
-                    digital_human_material,
-                    trange(tim(f"{current_time:.6f}s"), tim(f"{current_duration:.6f}s"))
-                )
-                
-                # 添加到数字人视频轨道
-                self.context.script.add_segment(loop_segment, track_name="数字人视频轨道")
-                
-                current_time += current_duration
+            # 一次性计算所有循环段的起始时间和时长，再批量添加到数字人视频轨道
+            starts, durations = loop_offsets(digital_human_duration_microseconds, target_duration_microseconds)
+            loop_segments = [
+                draft.VideoSegment(digital_human_material, trange_us(start_us, duration_us))
+                for start_us, duration_us in zip(starts.tolist(), durations.tolist())
+            ]
+            self.track_manager.add_segments(loop_segments, "数字人视频轨道")
             
-            self._log("info", f"数字人视频循环已添加: {os.path.basename(local_path)}，{loop_count}次循环，总时长: {target_duration:.2f}s")
+            self._log("info", f"数字人视频循环已添加: {file_name}，{len(starts)}次循环，总时长: {target_duration:.2f}s")
         
         return
         
@@ -199,78 +179,63 @@ class VideoProcessor(BaseProcessor):
             raise ProcessingError("请先创建草稿")
             
         # 确保背景视频轨道存在
-        from ..managers.track_manager import TrackManager
-        track_manager = TrackManager(self.context, self.logger)
-        track_manager.ensure_track_exists(draft.TrackType.video, "背景视频轨道")
+        self.track_manager.ensure_track_exists(draft.TrackType.video, "背景视频轨道")
         
         # 下载背景视频到本地
-        from ..managers.material_manager import MaterialManager
-        material_manager = MaterialManager(self.context, self.logger)
+        bg_video_local_path = self.material_manager.generate_unique_filename("background_video", ".mp4")
+        local_path = self.material_manager.download_material(background_video_url, bg_video_local_path)
         
-        bg_video_local_path = material_manager.generate_unique_filename("background_video", ".mp4")
-        local_path = material_manager.download_material(background_video_url, bg_video_local_path)
+        file_name = os.path.basename(local_path)
         
-        if local_path != background_video_url and not os.path.exists(local_path):
-            raise ProcessingError(f"背景视频文件不存在: {local_path}")
-        
-        # 获取背景视频素材信息
-        bg_video_material = draft.VideoMaterial(local_path)
+        # 获取背景视频素材信息，文件是否存在由加载时的 stat 一并判断
+        try:
+            bg_video_material = load_material(draft.VideoMaterial, local_path)
+        except FileNotFoundError:
+            if local_path != background_video_url:
+                raise ProcessingError(f"背景视频文件不存在: {local_path}")
+            raise
         
         # 确定目标时长（类似数字人视频的逻辑）
         if target_duration is None:
-            effective_duration = self.context.get_effective_video_duration()
-            if effective_duration > 0:
-                target_duration = round(effective_duration, 2)
-            elif self.context.video_duration > 0:
+            effective_us = self.context.get_effective_video_duration_us()
+            if effective_us > 0:
+                target_duration = round(effective_us / 1000000, 2)
+            elif self.context.video_duration_us > 0:
                 target_duration = round(self.context.video_duration, 2)
-            elif self.context.audio_duration > 0:
+            elif self.context.audio_duration_us > 0:
                 target_duration = round(self.context.audio_duration, 2)
             else:
                 raise ProcessingError("无法确定目标时长，请先添加音频或视频，或指定target_duration")
         
         # 验证时长边界
-        from ..managers.duration_manager import DurationManager
-        duration_manager = DurationManager(self.context, self.logger)
-        target_duration = duration_manager.validate_duration_bounds(target_duration, "背景视频")
+        target_duration = self.duration_manager.validate_duration_bounds(target_duration, "背景视频")
         
         # 添加背景视频（实现类似背景音乐的循环逻辑）
-        target_duration_microseconds = tim(f"{target_duration:.6f}s")
-        bg_video_duration_microseconds = bg_video_material.duration
-        bg_video_duration_seconds = bg_video_duration_microseconds / 1000000
+        target_duration_microseconds = sec_to_us(target_duration)
+        bg_video_duration_microseconds = int(bg_video_material.duration)
         
         # 清除现有背景视频段
-        track_manager.clear_track_segments("背景视频轨道")
+        self.track_manager.clear_track_segments("背景视频轨道")
         
-        if bg_video_duration_seconds >= target_duration:
+        if bg_video_duration_microseconds >= target_duration_microseconds:
             # 背景视频够长，直接截取
             bg_video_segment = draft.VideoSegment(
                 bg_video_material,
-                trange(tim("0s"), target_duration_microseconds)
+                trange_us(0, target_duration_microseconds)
             )
-            self.context.script.add_segment(bg_video_segment, track_name="背景视频轨道")
-            self._log("info", f"背景视频已添加: {os.path.basename(local_path)}，截取时长: {target_duration:.2f}s")
+            self.track_manager.add_segment(bg_video_segment, "背景视频轨道")
+            self._log("info", f"背景视频已添加: {file_name}，截取时长: {target_duration:.2f}s")
         else:
             # 背景视频太短，需要循环
-            self._log("info", f"背景视频时长 {bg_video_duration_seconds:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
-            
-            loop_count = int(target_duration / bg_video_duration_seconds) + 1
-            current_time = 0
+            self._log("info", f"背景视频时长 {bg_video_duration_microseconds / 1000000:.2f}s，目标时长 {target_duration:.2f}s，将循环播放")
             
-            for i in range(loop_count):
-                remaining_time = target_duration - current_time
-                if remaining_time <= 0:
-                    break
-                    
-                current_duration = min(bg_video_duration_seconds, remaining_time)
-                
-                loop_segment = draft.VideoSegment(
-                    bg_video_material,
-                    trange(tim(f"{current_time:.6f}s"), tim(f"{current_duration:.6f}s"))
-                )
-                
-                self.context.script.add_segment(loop_segment, track_name="背景视频轨道")
-                current_time += current_duration
+            starts, durations = loop_offsets(bg_video_duration_microseconds, target_duration_microseconds)
+            loop_segments = [
+                draft.VideoSegment(bg_video_material, trange_us(start_us, duration_us))
+                for start_us, duration_us in zip(starts.tolist(), durations.tolist())
+            ]
+            self.track_manager.add_segments(loop_segments, "背景视频轨道")
             
-            self._log("info", f"背景视频循环已添加: {os.path.basename(local_path)}，{loop_count}次循环，总时长: {target_duration:.2f}s")
+            self._log("info", f"背景视频循环已添加: {file_name}，{len(starts)}次循环，总时长: {target_duration:.2f}s")
         
         return
\ No newline at end of file
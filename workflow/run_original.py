@@ -12,6 +12,14 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.join(current_dir, '..')
 sys.path.insert(0, project_root)
 
+# 剪映草稿文件夹，可通过环境变量 JY_DRAFT_DIR 覆盖
+from workflow.paths import DRAFT_DIR
+
+def _import_workflow_class():
+    """导入原来的工作流类；该模块依赖较多，只在实际运行时才导入"""
+    from workflow.component.flow_python_implementation import VideoEditingWorkflow
+    return VideoEditingWorkflow
+
 def run_original_workflow():
     """运行原来的工作流功能"""
     
@@ -20,12 +28,12 @@ def run_original_workflow():
     
     try:
         # 导入原来的工作流类
-        from workflow.component.flow_python_implementation import VideoEditingWorkflow
+        VideoEditingWorkflow = _import_workflow_class()
         
         print("✅ 成功导入原来的工作流类")
         
         # 设置基本参数（请根据实际情况修改）
-        draft_folder_path = r"C:\Users\nrgc\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+        draft_folder_path = str(DRAFT_DIR)
         project_name = "original_workflow_test"
         
         print(f"📁 草稿文件夹: {draft_folder_path}")
@@ -74,10 +82,10 @@ def run_with_sample_data():
     print("=" * 50)
     
     try:
-        from workflow.component.flow_python_implementation import VideoEditingWorkflow
+        VideoEditingWorkflow = _import_workflow_class()
         
         # 基本设置
-        draft_folder_path = r"C:\Users\nrgc\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+        draft_folder_path = str(DRAFT_DIR)
         project_name = "sample_workflow"
         
         workflow = VideoEditingWorkflow(draft_folder_path, project_name)
@@ -152,6 +160,25 @@ def show_usage_guide():
     print("  2. 如果创建草稿失败，检查剪映文件夹权限")
     print("  3. 如果添加素材失败，检查文件是否存在")
 
+def _run_basic():
+    """菜单1：基础运行"""
+    workflow, save_path = run_original_workflow()
+    if workflow:
+        print(f"\n🎉 成功！您可以在剪映中打开: {save_path}")
+
+def _run_sample():
+    """菜单2：示例运行"""
+    workflow = run_with_sample_data()
+    if workflow:
+        print(f"\n🎉 示例完成！")
+
+# 菜单选项 -> 处理函数
+MENU_HANDLERS = {
+    "1": _run_basic,
+    "2": _run_sample,
+    "3": show_usage_guide,
+}
+
 def main():
     """主函数"""
     
@@ -164,21 +191,11 @@ def main():
     try:
         choice = input("\n请选择 (1/2/3): ").strip()
         
-        if choice == "1":
-            workflow, save_path = run_original_workflow()
-            if workflow:
-                print(f"\n🎉 成功！您可以在剪映中打开: {save_path}")
-                
-        elif choice == "2":
-            workflow = run_with_sample_data()
-            if workflow:
-                print(f"\n🎉 示例完成！")
-                
-        elif choice == "3":
-            show_usage_guide()
-            
-        else:
+        handler = MENU_HANDLERS.get(choice)
+        if handler is None:
             print("❌ 无效选择")
+        else:
+            handler()
             
     except KeyboardInterrupt:
         print("\n\n👋 用户取消操作")
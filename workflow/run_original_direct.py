@@ -7,10 +7,121 @@
 import os
 import sys
 
+# 项目路径在导入时计算一次，函数中直接复用
+_CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.normpath(os.path.join(_CURRENT_DIR, '..'))
+
 # 添加项目路径
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.join(current_dir, '..')
-sys.path.insert(0, project_root)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+# 剪映草稿文件夹，可通过环境变量 JY_DRAFT_DIR 覆盖
+from workflow.paths import DRAFT_DIR
+
+# 静态说明文字在导入时拼接好，每段只调用一次print输出
+_METHOD_USAGE = "\n".join([
+    "\n📋 您可以继续使用这些原来的方法:",
+    "```python",
+    "# 添加音频",
+    "workflow.add_audio('音频路径或URL', duration=30.0, volume=1.0)",
+    "",
+    "# 添加背景音乐",
+    "workflow.add_background_music('音乐路径', volume=0.3)",
+    "",
+    "# 添加视频",
+    "workflow.add_video('视频路径或URL', duration=30.0)",
+    "",
+    "# 添加数字人视频",
+    "workflow.add_digital_human_video('数字人视频URL', target_duration=30.0)",
+    "",
+    "# 添加字幕（从ASR结果）",
+    "asr_result = [",
+    "    {'text': '字幕内容', 'start_time': 0.0, 'end_time': 3.0},",
+    "    # 更多字幕...",
+    "]",
+    "workflow.add_subtitle_from_asr(asr_result)",
+    "",
+    "# 保存草稿",
+    "workflow.script.save()",
+    "```",
+])
+
+_IMPORT_ERROR_HELP = "\n".join([
+    "\n🔍 可能的原因:",
+    "  1. 原来的文件路径不正确",
+    "  2. 缺少依赖模块",
+    "\n💡 解决方法:",
+    "  检查这个文件是否存在:",
+    "  workflow/component/flow_python_implementation.py",
+])
+
+_RUN_ERROR_HELP = "\n".join([
+    "\n🔍 可能的原因:",
+    "  1. 剪映草稿文件夹路径不正确",
+    "  2. 没有权限访问剪映文件夹",
+    "  3. 剪映没有正确安装",
+    "\n💡 解决方法:",
+    "  1. 检查剪映安装路径",
+    "  2. 确保剪映草稿文件夹存在",
+    "  3. 以管理员权限运行",
+])
+
+_ALTERNATIVE_USAGE = "\n".join([
+    "\n" + "=" * 50,
+    "🔄 其他使用方法",
+    "=" * 50,
+    "如果上面的方法不工作，您也可以:",
+    "\n1️⃣ 直接在Python中使用:",
+    "```python",
+    "import sys",
+    "sys.path.append('d:/code/pyJianYingDraft')",
+    "",
+    "from workflow.component.flow_python_implementation import VideoEditingWorkflow",
+    "",
+    "# 修改为您的实际路径",
+    "draft_path = r'C:\\Users\\您的用户名\\AppData\\Local\\JianyingPro\\User Data\\Projects\\com.lveditor.draft'",
+    "workflow = VideoEditingWorkflow(draft_path, '我的项目')",
+    "workflow.create_draft()",
+    "workflow.save_draft()",
+    "```",
+    "\n2️⃣ 在原来的脚本中使用:",
+    "  找到您原来调用视频编辑功能的脚本",
+    "  那些代码应该仍然可以正常工作",
+    "\n3️⃣ 新优雅系统（需要修复API兼容性）:",
+    "  等待API兼容性修复完成后",
+    "  可以使用更简洁的新系统",
+])
+
+_MORE_HELP = "\n".join([
+    "\n📚 更多帮助:",
+    "  - 查看 workflow/component/flow_python_implementation.py",
+    "  - 查看 workflow/MIGRATION_GUIDE.md",
+    "  - 查看 workflow/ELEGANT_WORKFLOW_README.md",
+])
+
+def _save_draft_atomic(script) -> str:
+    """保存草稿：先把完整内容写入同目录的临时文件再原子替换，中断时不会留下写了一半的草稿
+    
+    Returns:
+        草稿保存路径
+    """
+    save_path = script.save_path
+    if save_path is None:
+        raise ValueError("没有设置保存路径, 可能不在模板模式下")
+        
+    data = script.dumps().encode('utf-8')
+    tmp_path = save_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return save_path
 
 def main():
     """直接演示原来的功能"""
@@ -25,7 +136,7 @@ def main():
         print("✅ 成功导入原来的工作流类")
         
         # 设置基本参数（请根据实际情况修改这些路径）
-        draft_folder_path = r"C:\Users\nrgc\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+        draft_folder_path = str(DRAFT_DIR)
         project_name = "test_original_workflow"
         
         print(f"📁 草稿文件夹: {draft_folder_path}")
@@ -42,96 +153,32 @@ def main():
         
         # 保存草稿
         print("\n💾 保存草稿...")
-        workflow.script.save()
-        save_path = workflow.script.save_path
+        save_path = _save_draft_atomic(workflow.script)
         print(f"✅ 草稿已保存到: {save_path}")
         
         print("\n🎉 原来的功能运行成功！")
         print(f"📂 您可以在剪映中打开这个项目: {save_path}")
         
-        print("\n📋 您可以继续使用这些原来的方法:")
-        print("```python")
-        print("# 添加音频")
-        print("workflow.add_audio('音频路径或URL', duration=30.0, volume=1.0)")
-        print("")
-        print("# 添加背景音乐") 
-        print("workflow.add_background_music('音乐路径', volume=0.3)")
-        print("")
-        print("# 添加视频")
-        print("workflow.add_video('视频路径或URL', duration=30.0)")
-        print("")
-        print("# 添加数字人视频")
-        print("workflow.add_digital_human_video('数字人视频URL', target_duration=30.0)")
-        print("")
-        print("# 添加字幕（从ASR结果）")
-        print("asr_result = [")
-        print("    {'text': '字幕内容', 'start_time': 0.0, 'end_time': 3.0},")
-        print("    # 更多字幕...")
-        print("]")
-        print("workflow.add_subtitle_from_asr(asr_result)")
-        print("")
-        print("# 保存草稿")
-        print("workflow.script.save()")
-        print("```")
+        print(_METHOD_USAGE)
         
         return True
         
     except ImportError as e:
         print(f"❌ 导入失败: {e}")
-        print("\n🔍 可能的原因:")
-        print("  1. 原来的文件路径不正确")
-        print("  2. 缺少依赖模块")
-        
-        print("\n💡 解决方法:")
-        print("  检查这个文件是否存在:")
-        print("  workflow/component/flow_python_implementation.py")
+        print(_IMPORT_ERROR_HELP)
         
         return False
         
     except Exception as e:
         print(f"❌ 运行出错: {e}")
-        print("\n🔍 可能的原因:")
-        print("  1. 剪映草稿文件夹路径不正确")
-        print("  2. 没有权限访问剪映文件夹")
-        print("  3. 剪映没有正确安装")
-        
-        print("\n💡 解决方法:")
-        print("  1. 检查剪映安装路径")
-        print("  2. 确保剪映草稿文件夹存在")
-        print("  3. 以管理员权限运行")
+        print(_RUN_ERROR_HELP)
         
         return False
 
 def show_alternative_usage():
     """显示替代使用方法"""
     
-    print("\n" + "=" * 50)
-    print("🔄 其他使用方法")
-    print("=" * 50)
-    
-    print("如果上面的方法不工作，您也可以:")
-    
-    print("\n1️⃣ 直接在Python中使用:")
-    print("```python")
-    print("import sys")
-    print("sys.path.append('d:/code/pyJianYingDraft')")
-    print("")
-    print("from workflow.component.flow_python_implementation import VideoEditingWorkflow")
-    print("")
-    print("# 修改为您的实际路径")
-    print("draft_path = r'C:\\Users\\您的用户名\\AppData\\Local\\JianyingPro\\User Data\\Projects\\com.lveditor.draft'")
-    print("workflow = VideoEditingWorkflow(draft_path, '我的项目')")
-    print("workflow.create_draft()")
-    print("workflow.save_draft()")
-    print("```")
-    
-    print("\n2️⃣ 在原来的脚本中使用:")
-    print("  找到您原来调用视频编辑功能的脚本")
-    print("  那些代码应该仍然可以正常工作")
-    
-    print("\n3️⃣ 新优雅系统（需要修复API兼容性）:")
-    print("  等待API兼容性修复完成后")
-    print("  可以使用更简洁的新系统")
+    print(_ALTERNATIVE_USAGE)
 
 if __name__ == "__main__":
     success = main()
@@ -142,7 +189,4 @@ if __name__ == "__main__":
     else:
         print("\n❌ 需要解决一些问题才能运行原来的功能。")
         
-    print("\n📚 更多帮助:")
-    print("  - 查看 workflow/component/flow_python_implementation.py")  
-    print("  - 查看 workflow/MIGRATION_GUIDE.md")
-    print("  - 查看 workflow/ELEGANT_WORKFLOW_README.md")
\ No newline at end of file
+    print(_MORE_HELP)
@@ -9,14 +9,41 @@
 import sys
 import os
 
+# 项目根目录在导入时计算一次
+_CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.normpath(os.path.join(_CURRENT_DIR, '..', '..'))
+
 # 添加项目根目录到路径
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+
+# 剪映草稿文件夹，可通过环境变量 JY_DRAFT_DIR 覆盖
+from workflow.paths import DRAFT_DIR
 
 from workflow.component.flow_python_implementation import VideoEditingWorkflow
 
 class CustomWorkflow:
     """自定义工作流类"""
     
+    # 输入参数默认值；title 未传入时由 prepare_inputs 填入项目名称
+    _DEFAULTS = {
+        # 必需参数
+        'audio_url': '',
+        'title': None,
+        
+        # 火山引擎ASR配置
+        'volcengine_appid': '6046310832',
+        'volcengine_access_token': '',
+        
+        # 豆包API配置（可选）
+        'doubao_token': '',
+        'doubao_model': 'doubao-1-5-pro-32k-250115',
+        
+        # 可选参数
+        'subtitle_delay': 0.0,
+        'subtitle_speed': 1.0,
+    }
+    
     def __init__(self, draft_folder_path: str, project_name: str = "custom_workflow"):
         """初始化工作流
         
@@ -37,31 +64,8 @@ class CustomWorkflow:
         Returns:
             配置好的输入参数字典
         """
-        # 基础配置
-        inputs = {
-            # 必需参数
-            'audio_url': kwargs.get('audio_url', ''),
-            'title': kwargs.get('title', self.project_name),
-            
-            # 火山引擎ASR配置
-            'volcengine_appid': kwargs.get('volcengine_appid', '6046310832'),
-            'volcengine_access_token': kwargs.get('volcengine_access_token', ''),
-            
-            # 豆包API配置（可选）
-            'doubao_token': kwargs.get('doubao_token', ''),
-            'doubao_model': kwargs.get('doubao_model', 'doubao-1-5-pro-32k-250115'),
-            
-            # 可选参数
-            'subtitle_delay': kwargs.get('subtitle_delay', 0.0),
-            'subtitle_speed': kwargs.get('subtitle_speed', 1.0),
-        }
-        
-        # 添加其他自定义参数
-        for key, value in kwargs.items():
-            if key not in inputs:
-                inputs[key] = value
-        
-        return inputs
+        # 默认值与自定义参数一次合并，自定义参数覆盖默认值
+        return {**self._DEFAULTS, 'title': self.project_name, **kwargs}
     
     def pre_process(self, inputs: dict) -> dict:
         """预处理步骤（可重写）
@@ -130,7 +134,7 @@ class CustomWorkflow:
 def create_custom_workflow():
     """创建自定义工作流的示例函数"""
     # 配置路径
-    draft_folder_path = r"C:\Users\nrgc\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+    draft_folder_path = str(DRAFT_DIR)
     
     # 创建工作流实例
     workflow = CustomWorkflow(draft_folder_path, "my_custom_workflow")
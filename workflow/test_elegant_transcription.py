@@ -6,38 +6,179 @@
 
 import os
 import sys
+import json
 import time
+from functools import cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 项目路径在导入时计算一次，函数中直接复用
+_CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.normpath(os.path.join(_CURRENT_DIR, '..'))
 
 # 添加项目路径
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.join(current_dir, '..')
-sys.path.insert(0, project_root)
-
-# 尝试导入新架构，如果失败则回退到原架构
-try:
-    # 新架构导入（修复API兼容性后）
-    from workflow.elegant_workflow import create_elegant_workflow
-    USE_NEW_ARCHITECTURE = True
-    print("✅ 使用新优雅架构")
-except ImportError as e:
-    # 回退到原架构
-    from workflow.component.flow_python_implementation import VideoEditingWorkflow
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+# 剪映草稿文件夹，可通过环境变量 JY_DRAFT_DIR 覆盖
+from workflow.paths import DRAFT_DIR
+
+# 华尔兹背景音乐路径
+_BACKGROUND_MUSIC_PATH = os.path.join(_PROJECT_ROOT, '华尔兹.mp3')
+
+# ASR提交/轮询和豆包请求共用的HTTP会话，连接在多次请求间复用
+_HTTP = requests.Session()
+_HTTP.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2))
+
+# 架构选择结果缓存，workflow 包内任一 .py 文件修改后失效；
+# 只缓存 workflow 自身模块导入失败的结果，缺少第三方依赖时每次重新探测，安装后即可生效
+_ARCH_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'pyJianYingDraft', 'arch.json')
+
+def _workflow_package_mtime() -> int:
+    """workflow 包内所有 .py 文件的最新修改时间（纳秒）"""
+    latest = 0
+    for dirpath, dirnames, filenames in os.walk(_CURRENT_DIR):
+        dirnames[:] = [d for d in dirnames if d != '__pycache__']
+        for name in filenames:
+            if name.endswith('.py'):
+                latest = max(latest, os.stat(os.path.join(dirpath, name)).st_mtime_ns)
+    return latest
+
+def _load_architecture_decision(package_mtime: int):
+    """读取缓存的架构选择，缓存不存在、已过期或无法解析时返回None"""
+    try:
+        with open(_ARCH_CACHE_PATH, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data['package_mtime_ns'] != package_mtime:
+            return None
+        return bool(data['new_arch'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_architecture_decision(new_arch: bool, package_mtime: int):
+    """缓存架构选择及对应的包修改时间，写入失败时忽略"""
+    try:
+        os.makedirs(os.path.dirname(_ARCH_CACHE_PATH), exist_ok=True)
+        with open(_ARCH_CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump({"new_arch": new_arch, "package_mtime_ns": package_mtime}, f)
+    except OSError:
+        pass
+
+# 尝试导入新架构，如果失败则回退到原架构；已知新架构不可用时跳过导入探测
+_package_mtime = _workflow_package_mtime()
+_cached_new_arch = _load_architecture_decision(_package_mtime)
+if _cached_new_arch is False:
     USE_NEW_ARCHITECTURE = False
-    print(f"⚠️ 新架构暂时不可用({e})，回退到原架构")
+    print(f"⚠️ 新架构暂时不可用(缓存: {_ARCH_CACHE_PATH})，回退到原架构")
+else:
+    try:
+        # 新架构导入（修复API兼容性后）
+        from workflow.elegant_workflow import create_elegant_workflow
+        USE_NEW_ARCHITECTURE = True
+        print("✅ 使用新优雅架构")
+    except ImportError as e:
+        # 回退到原架构，原架构类在创建工作流时才导入
+        USE_NEW_ARCHITECTURE = False
+        print(f"⚠️ 新架构暂时不可用({e})，回退到原架构")
+        _cacheable = (e.name or '').partition('.')[0] == 'workflow'
+    else:
+        _cacheable = True
+    if _cacheable and _cached_new_arch is not USE_NEW_ARCHITECTURE:
+        _save_architecture_decision(USE_NEW_ARCHITECTURE, _package_mtime)
+
+# 静态说明文字在导入时拼接好，每段只调用一次print输出
+_BANNER = "\n".join([
+    "🎬 音频转录智能字幕工作流 + AI关键词高亮 + 背景音乐",
+    "=" * 60,
+    "📋 功能说明:",
+    "  • 自动转录音频并生成智能字幕",
+    "  • 使用AI识别关键词进行高亮显示",
+    "  • 添加华尔兹背景音乐",
+    "  • 采用新优雅架构（如可用）",
+])
+
+_FEATURE_SUMMARY = "\n".join([
+    "\n📊 处理功能总结:",
+    "  ✅ 音频转录: ASR语音识别",
+    "  ✅ 智能字幕: 自动生成时间轴",
+    "  ✅ 关键词高亮: AI识别重点词汇",
+    "  ✅ 数字人视频: 自动循环匹配",
+    "  ✅ 背景音乐: 华尔兹循环播放",
+])
+
+_TROUBLESHOOTING = "\n".join([
+    "\n💡 可能的解决方案:",
+    "  1. 检查剪映草稿文件夹路径是否正确",
+    "  2. 确认火山引擎ASR配置是否有效",
+    "  3. 验证豆包API token是否可用",
+    "  4. 检查网络连接和素材URL是否可访问",
+    "  5. 确保华尔兹.mp3文件存在",
+])
+
+_ARCHITECTURE_FEATURES = "\n".join([
+    "\n🏗️ 架构对比说明",
+    "=" * 60,
+    "📊 新优雅架构特性:",
+    "  • 模块化设计，职责清晰分离",
+    "  • 统一2位小数精度控制",
+    "  • 完整的边界验证和错误处理",
+    "  • 支持简化和完整两种工作流模式",
+    "  • 详细的执行日志和统计信息",
+    "  • 非破坏性编辑保证",
+    "\n📊 架构使用状态:",
+])
+
+_ARCHITECTURE_COMPATIBILITY = "\n".join([
+    "\n🔄 功能完全兼容:",
+    "  • 无论使用哪种架构，功能完全一致",
+    "  • 自动选择最佳可用架构",
+    "  • 保证业务功能不受影响",
+])
+
+_USAGE_GUIDE = "\n".join([
+    "\n📚 使用指南",
+    "=" * 60,
+    "🔧 直接运行:",
+    "  python workflow/test_elegant_transcription.py",
+    "\n🔧 自定义参数运行:",
+    "```python",
+    "# 修改main()函数中的inputs配置",
+    "inputs = {",
+    '    "audio_url": "您的音频URL",',
+    '    "digital_video_url": "您的数字人视频URL",',
+    '    "title": "您的标题",',
+    '    "content": "您的内容提示",',
+    '    # ... 其他配置',
+    "}",
+    "```",
+    "\n🔧 集成到其他项目:",
+    "```python",
+    "from workflow.test_elegant_transcription import main",
+    "save_path = main()  # 返回保存路径",
+    "```",
+])
 
 def create_workflow_with_new_architecture(draft_folder_path: str, project_name: str):
     """使用新架构创建工作流"""
     workflow = create_elegant_workflow(draft_folder_path, project_name)
     return workflow
 
+@cache
+def _old_workflow_class():
+    """原架构模块依赖较多，只在实际使用原架构时导入一次并缓存"""
+    from workflow.component.flow_python_implementation import VideoEditingWorkflow
+    return VideoEditingWorkflow
+
 def create_workflow_with_old_architecture(draft_folder_path: str, project_name: str):
     """使用原架构创建工作流"""
-    workflow = VideoEditingWorkflow(draft_folder_path, project_name)
+    workflow = _old_workflow_class()(draft_folder_path, project_name)
     return workflow
 
 def process_with_new_architecture(workflow, inputs):
     """使用新架构处理完整工作流"""
     # 转换输入格式为新架构格式
+    # 素材下载由工作流内部的 MaterialManager.prefetch 在后台并发完成，与ASR重叠
     new_inputs = {
         "audio_url": inputs.get("audio_url"),
         "video_url": inputs.get("digital_video_url"),  # 映射数字人视频
@@ -55,6 +196,7 @@ def process_with_new_architecture(workflow, inputs):
         "volcengine_access_token": inputs.get("volcengine_access_token"),
         "doubao_token": inputs.get("doubao_token"),
         "doubao_model": inputs.get("doubao_model"),
+        "http_session": inputs.get("http_session"),
     }
     
     # 使用新架构的完整工作流处理
@@ -68,22 +210,14 @@ def process_with_old_architecture(workflow, inputs):
 def main():
     """主函数 - 音频转录智能字幕工作流（新架构版本）"""
     
-    print("🎬 音频转录智能字幕工作流 + AI关键词高亮 + 背景音乐")
-    print("=" * 60)
-    print("📋 功能说明:")
-    print("  • 自动转录音频并生成智能字幕")
-    print("  • 使用AI识别关键词进行高亮显示") 
-    print("  • 添加华尔兹背景音乐")
-    print("  • 采用新优雅架构（如可用）")
+    print(_BANNER)
     
     # 配置剪映草稿文件夹路径
-    draft_folder_path = r"C:\Users\nrgc\AppData\Local\JianyingPro\User Data\Projects\com.lveditor.draft"
+    draft_folder_path = str(DRAFT_DIR)
     project_name = "elegant_audio_transcription_demo"
     
     # 配置华尔兹背景音乐路径
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.join(current_dir, '..')
-    background_music_path = os.path.join(project_root, '华尔兹.mp3')
+    background_music_path = _BACKGROUND_MUSIC_PATH
     
     print(f"\n📁 草稿文件夹: {draft_folder_path}")
     print(f"📝 项目名称: {project_name}")
@@ -110,9 +244,12 @@ def main():
         # 背景音乐配置
         'background_music_path': background_music_path,
         'background_music_volume': 0.25,
+        
+        # 共用的HTTP会话
+        'http_session': _HTTP,
     }
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     try:
         print(f"\n🏗️ 创建工作流实例...")
@@ -134,19 +271,14 @@ def main():
             save_path = process_with_old_architecture(workflow, inputs)
         
         # 计算执行时间
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         
         print(f"\n🎉 音频转录工作流完成!")
         print(f"⏱️ 执行时间: {execution_time:.2f}秒")
         print(f"📂 剪映项目已保存到: {save_path}")
         
         # 显示功能总结
-        print(f"\n📊 处理功能总结:")
-        print(f"  ✅ 音频转录: ASR语音识别")
-        print(f"  ✅ 智能字幕: 自动生成时间轴")
-        print(f"  ✅ 关键词高亮: AI识别重点词汇") 
-        print(f"  ✅ 数字人视频: 自动循环匹配")
-        print(f"  ✅ 背景音乐: 华尔兹循环播放")
+        print(_FEATURE_SUMMARY)
         print(f"  ✅ 架构: {'新优雅模块化' if USE_NEW_ARCHITECTURE else '原稳定版本'}")
         
         print(f"\n🎬 请打开剪映查看生成的智能字幕视频项目")
@@ -154,78 +286,36 @@ def main():
         return save_path
         
     except Exception as e:
-        execution_time = time.time() - start_time
+        execution_time = time.perf_counter() - start_time
         print(f"\n❌ 工作流失败: {e}")
         print(f"⏱️ 失败前耗时: {execution_time:.2f}秒")
         
-        # 显示详细错误信息
+        # 显示详细错误信息：整段回溯先格式化为一个字符串，再一次写出
         import traceback
         print(f"\n🔍 详细错误信息:")
-        traceback.print_exc()
+        sys.stdout.flush()
+        sys.stderr.write("".join(traceback.format_exception(type(e), e, e.__traceback__)))
         
         # 提供解决建议
-        print(f"\n💡 可能的解决方案:")
-        print(f"  1. 检查剪映草稿文件夹路径是否正确")
-        print(f"  2. 确认火山引擎ASR配置是否有效")
-        print(f"  3. 验证豆包API token是否可用")
-        print(f"  4. 检查网络连接和素材URL是否可访问")
-        print(f"  5. 确保华尔兹.mp3文件存在")
+        print(_TROUBLESHOOTING)
         
         return None
 
 def demo_architecture_comparison():
     """演示新旧架构对比"""
     
-    print(f"\n🏗️ 架构对比说明")
-    print("=" * 60)
-    
-    print("📊 新优雅架构特性:")
-    print("  • 模块化设计，职责清晰分离")
-    print("  • 统一2位小数精度控制")
-    print("  • 完整的边界验证和错误处理")
-    print("  • 支持简化和完整两种工作流模式")
-    print("  • 详细的执行日志和统计信息")
-    print("  • 非破坏性编辑保证")
-    
-    print(f"\n📊 架构使用状态:")
+    print(_ARCHITECTURE_FEATURES)
     if USE_NEW_ARCHITECTURE:
-        print("  ✅ 当前使用新优雅架构")
-        print("  🎯 享受模块化设计的优势")
+        print("  ✅ 当前使用新优雅架构\n  🎯 享受模块化设计的优势")
     else:
-        print("  ⚠️ 当前使用原架构（稳定版本）")
-        print("  🔧 等待新架构API兼容性修复")
+        print("  ⚠️ 当前使用原架构（稳定版本）\n  🔧 等待新架构API兼容性修复")
     
-    print(f"\n🔄 功能完全兼容:")
-    print("  • 无论使用哪种架构，功能完全一致")
-    print("  • 自动选择最佳可用架构")
-    print("  • 保证业务功能不受影响")
+    print(_ARCHITECTURE_COMPATIBILITY)
 
 def show_usage_guide():
     """显示使用指南"""
     
-    print(f"\n📚 使用指南")
-    print("=" * 60)
-    
-    print("🔧 直接运行:")
-    print("  python workflow/test_elegant_transcription.py")
-    
-    print(f"\n🔧 自定义参数运行:")
-    print("```python")
-    print("# 修改main()函数中的inputs配置")
-    print("inputs = {")
-    print('    "audio_url": "您的音频URL",')
-    print('    "digital_video_url": "您的数字人视频URL",')
-    print('    "title": "您的标题",')
-    print('    "content": "您的内容提示",')
-    print('    # ... 其他配置')
-    print("}")
-    print("```")
-    
-    print(f"\n🔧 集成到其他项目:")
-    print("```python")
-    print("from workflow.test_elegant_transcription import main")
-    print("save_path = main()  # 返回保存路径")
-    print("```")
+    print(_USAGE_GUIDE)
 
 if __name__ == "__main__":
     # 显示架构对比
@@ -0,0 +1,13 @@
+"""
+工具模块
+
+提供数值计算等通用辅助功能
+"""
+
+from .numeric import loop_offsets, sec_to_us, trange_us
+
+__all__ = [
+    'loop_offsets',
+    'sec_to_us',
+    'trange_us'
+]
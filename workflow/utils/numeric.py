@@ -0,0 +1,40 @@
+"""
+数值计算工具
+
+提供微秒换算、循环铺满等时间轴计算
+"""
+
+import numpy as np
+from typing import Tuple
+from pyJianYingDraft import Timerange
+
+def sec_to_us(seconds: float) -> int:
+    """秒转整数微秒，替代 tim(f"...s") 的格式化再解析"""
+    return int(round(seconds * 1000000))
+
+def trange_us(start_us: int, duration_us: int) -> Timerange:
+    """直接用整数微秒构造Timerange，跳过tim()的类型判断和取整"""
+    return Timerange(start_us, duration_us)
+
+def loop_offsets(source_us: int, target_us: int) -> Tuple[np.ndarray, np.ndarray]:
+    """计算用素材循环铺满目标时长时，每段的起始时间和持续时长
+    
+    Args:
+        source_us: 单次素材时长（微秒），必须大于0
+        target_us: 目标总时长（微秒）
+        
+    Returns:
+        (起始时间数组, 持续时长数组)，均为int64微秒，最后一段可能不足一次素材时长
+    """
+    if source_us <= 0:
+        raise ValueError("素材时长必须大于0")
+    if target_us <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.copy()
+    full_loops, remainder = divmod(target_us, source_us)
+    count = full_loops + (1 if remainder else 0)
+    starts = np.arange(count, dtype=np.int64) * source_us
+    durations = np.full(count, source_us, dtype=np.int64)
+    if remainder:
+        durations[-1] = remainder
+    return starts, durations